@@ -1,102 +1,229 @@
-import tkinter as tk
-from tkinter import ttk
-
-class TreeNode:
-    def __init__(self, name):
-        """
-        Initializes a tree node.
-        :param name: Name of the node (e.g., category or service name).
-        """
-        self.name = name
-        self.children = []
-
-    def add_child(self, child_node):
-        """
-        Adds a child node to this node.
-        :param child_node: TreeNode to be added as a child.
-        """
-        self.children.append(child_node)
-
-    def display_tree(self, level=0):
-        """
-        Recursively prints the tree structure.
-        :param level: Current depth of the tree for formatting.
-        """
-        print(" " * level * 4 + f"- {self.name}")
-        for child in self.children:
-            child.display_tree(level + 1)
-
-
-# Example Hierarchical Tree
-def create_service_tree():
-    """
-    Creates a sample tree structure for the subscription-based car maintenance service.
-    """
-    # Root
-    root = TreeNode("Car Maintenance Services")
-
-    # Level 1
-    oil_services = TreeNode("Oil Services")
-    tire_services = TreeNode("Tire Services")
-    engine_services = TreeNode("Engine Services")
-
-    # Add Level 1 to root
-    root.add_child(oil_services)
-    root.add_child(tire_services)
-    root.add_child(engine_services)
-
-    # Level 2 for Oil Services
-    oil_change = TreeNode("Oil Change")
-    oil_filter_replacement = TreeNode("Oil Filter Replacement")
-    oil_services.add_child(oil_change)
-    oil_services.add_child(oil_filter_replacement)
-
-    # Level 2 for Tire Services
-    tire_rotation = TreeNode("Tire Rotation")
-    tire_replacement = TreeNode("Tire Replacement")
-    tire_services.add_child(tire_rotation)
-    tire_services.add_child(tire_replacement)
-
-    # Level 2 for Engine Services
-    engine_diagnosis = TreeNode("Engine Diagnosis")
-    spark_plug_replacement = TreeNode("Spark Plug Replacement")
-    engine_services.add_child(engine_diagnosis)
-    engine_services.add_child(spark_plug_replacement)
-
-    return root
-
-
-class TreeApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Service Hierarchy - Tree View")
-        self.root.geometry("600x400")
-        self.root.configure(bg="#f5f5f5")
-
-        # TreeView Widget
-        self.tree = ttk.Treeview(root)
-        self.tree.heading("#0", text="Car Maintenance Service Hierarchy", anchor="w")
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-        # Populate Tree
-        self.populate_tree()
-
-    def populate_tree(self):
-        service_tree = create_service_tree()
-        self.add_node_to_tree(service_tree)
-
-    def add_node_to_tree(self, node, parent=""):
-        """
-        Recursively adds nodes to the TreeView widget.
-        :param node: Current TreeNode object to be added.
-        :param parent: Parent ID in the TreeView widget.
-        """
-        tree_id = self.tree.insert(parent, "end", text=node.name)
-        for child in node.children:
-            self.add_node_to_tree(child, parent=tree_id)
-
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = TreeApp(root)
-    root.mainloop()
+from core.service_tree import (
+    TreeNode,
+    ServiceSearchIndex,
+    IndexedServiceTree,
+    create_service_tree,
+    load_service_tree,
+)
+from core.background import BackgroundJob
+from core.lazy import LazyModule
+
+tk = LazyModule("tkinter")
+ttk = LazyModule("tkinter.ttk")
+
+class TreeApp:
+    # Text of the dummy item that makes an unloaded node show an expand arrow
+    PLACEHOLDER = "Loading..."
+    # Typing pause before the suggestions are looked up
+    SEARCH_DELAY_MS = 150
+
+    def __init__(self, root, lazy=True, service_file=None):
+        """
+        :param lazy: Insert subtrees only when they are expanded, instead of all at startup.
+        :param service_file: Optional parent,name CSV/JSONL file to load instead of the built-in catalog.
+        """
+        self.root = root
+        self.root.title("Service Hierarchy - Tree View")
+        self.root.geometry("600x400")
+        self.root.configure(bg="#f5f5f5")
+        self.lazy = lazy
+        self.service_file = service_file
+        self.service_tree = None
+        self.service_index = None  # Set once the search index has been built, after the tree is shown
+        self.job = None
+        self.node_for_item = {}  # Treeview item id -> TreeNode, for items whose children aren't loaded yet
+        self.item_for_node = {}  # TreeNode -> Treeview item id, for every inserted node
+        self.suggestions = []  # (name, path) shown in the suggestion list
+        self.pending_search = None  # after() id of the debounced search
+
+        # Search box with suggestions
+        search_frame = tk.Frame(root, bg="#f5f5f5")
+        search_frame.pack(fill=tk.X, padx=20, pady=(10, 0))
+        tk.Label(search_frame, text="Search:", bg="#f5f5f5", font=("Arial", 10)).pack(side=tk.LEFT)
+        self.search_entry = tk.Entry(search_frame)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_entry.bind("<KeyRelease>", self.on_search)
+        self.suggestion_list = tk.Listbox(root, height=4)
+        self.suggestion_list.pack(fill=tk.X, padx=20)
+        self.suggestion_list.bind("<<ListboxSelect>>", self.on_suggestion_select)
+
+        # Progress of the background build, with a way to stop it
+        status_frame = tk.Frame(root, bg="#f5f5f5")
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=(0, 10))
+        self.status_label = tk.Label(status_frame, text="", bg="#f5f5f5", font=("Arial", 10))
+        self.status_label.pack(side=tk.LEFT)
+        self.cancel_button = tk.Button(status_frame, text="Cancel", state=tk.DISABLED, command=self.cancel_job)
+        self.cancel_button.pack(side=tk.RIGHT)
+
+        # TreeView Widget
+        self.tree = ttk.Treeview(root)
+        self.tree.heading("#0", text="Car Maintenance Service Hierarchy", anchor="w")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        self.tree.bind("<<TreeviewOpen>>", self.on_open)
+
+        # Populate Tree
+        self.populate_tree()
+
+    def populate_tree(self):
+        """
+        Builds the service tree on a worker thread.
+        When not lazy, the nodes are then streamed into the Treeview in batches.
+        The search index is built by a second job once the tree is shown.
+        """
+        built = {}
+
+        def work(job):
+            service_tree = load_service_tree(self.service_file) if self.service_file else create_service_tree()
+            built["tree"] = service_tree
+            if self.lazy:
+                return ()
+            job.total = service_tree.subtree_size
+            return (node for node, depth in service_tree.iter_preorder())
+
+        def progress(delivered, total):
+            if total:
+                self.status_label.config(text=f"Loading services... {delivered}/{total}")
+
+        def done(job):
+            self.job = None
+            self.cancel_button.config(state=tk.DISABLED)
+            if job.error is not None:
+                self.status_label.config(text=f"Could not load services: {job.error}")
+            elif job.cancelled:
+                self.status_label.config(text="Loading cancelled.")
+            else:
+                self.service_tree = built["tree"]
+                if self.lazy:
+                    root_id = self.tree.insert("", "end", text=self.service_tree.name, open=True)
+                    self.item_for_node[self.service_tree] = root_id
+                    self.load_children(root_id, self.service_tree)
+                self.build_search_index()
+
+        self.status_label.config(text="Loading services...")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.job = BackgroundJob(work, self.insert_nodes, on_done=done, on_progress=progress)
+        self.job.start(self.root)
+
+    def build_search_index(self):
+        """
+        Indexes the loaded tree for search on a worker thread; the tree can be browsed meanwhile.
+        """
+        built = {}
+
+        def work(job):
+            built["index"] = IndexedServiceTree(self.service_tree, searchable=True)
+            return ()
+
+        def done(job):
+            self.job = None
+            self.cancel_button.config(state=tk.DISABLED)
+            if job.error is not None:
+                self.status_label.config(text=f"Could not index services: {job.error}")
+            elif job.cancelled:
+                self.status_label.config(text="Indexing cancelled; search is unavailable.")
+            else:
+                self.service_index = built["index"]
+                self.status_label.config(text=f"{self.service_tree.subtree_size} services.")
+                self.search_now()  # Anything typed while indexing
+
+        self.status_label.config(text="Indexing services for search...")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.job = BackgroundJob(work, None, on_done=done)
+        self.job.start(self.root)
+
+    def insert_nodes(self, nodes):
+        # Pre-order, so every node's parent already has a Treeview item
+        for node in nodes:
+            self.item_for_node[node] = self.tree.insert(self.item_for_node.get(node.parent, ""), "end", text=node.name)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def add_node_to_tree(self, node, parent=""):
+        """
+        Adds a node and its whole subtree to the TreeView widget.
+        :param node: Current TreeNode object to be added.
+        :param parent: Parent ID in the TreeView widget.
+        """
+        stack = [(node, parent)]
+        while stack:
+            current, parent_id = stack.pop()
+            tree_id = self.tree.insert(parent_id, "end", text=current.name)
+            self.item_for_node[current] = tree_id
+            for child in reversed(current.children):
+                stack.append((child, tree_id))
+
+    def load_children(self, tree_id, node):
+        """
+        Inserts the direct children of node under tree_id, giving each child
+        that has children of its own a placeholder so it can be expanded.
+        """
+        for child in node.children:
+            child_id = self.tree.insert(tree_id, "end", text=child.name)
+            self.item_for_node[child] = child_id
+            if child.children:
+                self.tree.insert(child_id, "end", text=self.PLACEHOLDER)
+                self.node_for_item[child_id] = child
+
+    def on_open(self, event):
+        self.expand_item(self.tree.focus())
+
+    def expand_item(self, tree_id):
+        node = self.node_for_item.pop(tree_id, None)
+        if node is not None:
+            self.tree.delete(*self.tree.get_children(tree_id))
+            self.load_children(tree_id, node)
+
+    def on_search(self, event):
+        # Restart the delay on every key, so a burst of typing is looked up once
+        if self.pending_search is not None:
+            self.root.after_cancel(self.pending_search)
+        self.pending_search = self.root.after(self.SEARCH_DELAY_MS, self.search_now)
+
+    def search_now(self):
+        self.pending_search = None
+        if self.service_index is None:
+            return  # Still being built; searched again once it is ready
+        query = self.search_entry.get().strip()
+        search = self.service_index.search
+        if query:
+            self.suggestions = search.complete(query, limit=10)
+            if not self.suggestions:
+                # Nothing starts with the query, so allow one typo in what has been typed so far
+                matches = search.fuzzy(query, max_distance=1, limit=10, prefixes=True)
+                self.suggestions = [(name, path) for name, distance, path in matches]
+        else:
+            self.suggestions = []
+        self.suggestion_list.delete(0, tk.END)
+        for name, path in self.suggestions:
+            self.suggestion_list.insert(tk.END, " > ".join(path))
+
+    def on_suggestion_select(self, event):
+        selection = self.suggestion_list.curselection()
+        if selection:
+            name, path = self.suggestions[selection[0]]
+            self.reveal(self.service_index.find(name))
+
+    def reveal(self, node):
+        """
+        Loads and opens every ancestor of node, then selects it in the Treeview.
+        """
+        ancestors = []
+        current = node.parent
+        while current is not None:
+            ancestors.append(current)
+            current = current.parent
+        for ancestor in reversed(ancestors):
+            tree_id = self.item_for_node[ancestor]
+            self.expand_item(tree_id)
+            self.tree.item(tree_id, open=True)
+        tree_id = self.item_for_node[node]
+        self.tree.selection_set(tree_id)
+        self.tree.see(tree_id)
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = TreeApp(root)
+    root.mainloop()
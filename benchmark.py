@@ -0,0 +1,615 @@
+"""
+Headless scaling benchmarks for every data structure in the project.
+
+Runs each structure's public operations at several sizes, with random and
+adversarial (sorted / worst-case) input, and records time and peak memory per
+operation as JSON. A previous results file can be passed to flag regressions.
+
+    python benchmark.py --sizes 1000 10000 100000 1000000 --output results.json
+    python benchmark.py --compare results.json --threshold 1.25
+    python benchmark.py --report sorting dispatch_day
+"""
+import argparse
+import heapq
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from core import dispatch_queue, order_deque, order_list, priority_orders, service_tree, task_tree
+
+ORDERS = ("random", "adversarial")
+
+# Quadratic cases are skipped above these sizes so a full run still finishes
+QUADRATIC_LIMIT = 10000
+
+
+def make_keys(n, order):
+    """
+    Random input is shuffled; adversarial input is already sorted, which is the
+    worst case for an unbalanced BST and the best case for natural merge sort.
+    """
+    keys = list(range(n))
+    if order == "random":
+        random.shuffle(keys)
+    return keys
+
+
+def bench_task_tree(tree_class):
+    def scenario(n, order, measure):
+        keys = make_keys(n, order)
+        tasks = [{"type": "Oil Change", "priority": key, "customer": f"Customer {key % 1000}"} for key in keys]
+        tree = tree_class()
+
+        def add():
+            for task in tasks:
+                tree.add_task(task)
+
+        def search():
+            for key in keys:
+                tree.find_task(key)
+
+        measure("add_task", add)
+        measure("find_task", search)
+        measure("get_tasks_in_priority_order", tree.get_tasks_in_priority_order)
+        measure("tasks_in_range", lambda: list(tree.tasks_in_range(n // 4, n // 4 + 100)), count=1)
+        measure("find_tasks_by_customer", lambda: [tree.find_tasks_by_customer(f"Customer {i}") for i in range(1000)], count=1000)
+    return scenario
+
+
+def bench_order_deque(max_size=None, overflow=order_deque.OVERFLOW_REJECT):
+    def scenario(n, order, measure):
+        orders = [{"order_id": str(i), "customer": "Customer", "service": "Oil Change"} for i in range(n)]
+        deque = order_deque.OrderDeque(max_size or n, overflow=overflow)
+
+        def push():
+            if order == "random":
+                for i, item in enumerate(orders):
+                    if i % 2:
+                        deque.add_order_rear(item)
+                    else:
+                        deque.add_order_front(item)
+            else:
+                for item in orders:
+                    deque.add_order_rear(item)
+
+        def pop():
+            if order == "random":
+                for i in range(n):
+                    if i % 2:
+                        deque.remove_order_rear()
+                    else:
+                        deque.remove_order_front()
+            else:
+                # Pop from the end that was filled last, the slow path for a spilled deque
+                for _ in range(n):
+                    deque.remove_order_rear()
+
+        measure("push", push)
+        measure("display_orders", deque.display_orders)
+        measure("orders_window", lambda: [deque.orders_window(start, 25) for start in range(0, n, max(1, n // 100))], count=100)
+        measure("pop", pop)
+        deque.close()
+    return scenario
+
+
+def bench_priority_list(list_class):
+    def scenario(n, order, measure):
+        priorities = [random.randint(1, 3) for _ in range(n)] if order == "random" else [3 - i * 3 // n for i in range(n)]
+        orders = list_class()
+
+        def add():
+            for i, priority in enumerate(priorities):
+                orders.add_order(str(i), f"Customer {i % 1000}", "Oil Change", priority)
+
+        measure("add_order", add)
+        measure("insertion_sort", orders.insertion_sort, max_n=QUADRATIC_LIMIT if list_class is priority_orders.SinglyLinkedList else None)
+        measure("merge_sort", lambda: orders.merge_sort(lambda node: (node.priority, node.customer_name, node.order_id)))
+        measure("display_orders", orders.display_orders)
+    return scenario
+
+
+def bench_cancellation_list(n, order, measure):
+    orders = order_list.SinglyLinkedList()
+    ids = [str(i) for i in range(n)]
+    # Adversarial cancellations hit the far end of the list first
+    cancel_ids = ids[::-1] if order == "adversarial" else random.sample(ids, n)
+
+    def add():
+        for order_id in ids:
+            orders.add_order(order_id, "Customer", "Oil Change")
+
+    measure("add_order", add)
+    measure("iter_orders_page", lambda: [list(orders.iter_orders(start_after=ids[i], limit=20)) for i in range(0, n, max(1, n // 100))], count=100)
+    measure("display_orders", orders.display_orders)
+    measure("remove_order", lambda: [orders.remove_order(order_id) for order_id in cancel_ids[:n // 2]], count=n // 2)
+    measure("remove_many", lambda: orders.remove_many(cancel_ids[n // 2:]), count=n - n // 2)
+
+
+def bench_service_tree(n, order, measure):
+    nodes = [service_tree.TreeNode("Root", {"price": 0})]
+
+    def add():
+        for i in range(1, n):
+            # Adversarial input is one long chain, the worst case for recursive code
+            parent = nodes[-1] if order == "adversarial" else nodes[random.randrange(len(nodes))]
+            node = service_tree.TreeNode(f"Service {i}", {"price": i % 100})
+            parent.add_child(node)
+            nodes.append(node)
+
+    root = nodes[0]
+    measure("add_child", add, count=n - 1)
+    measure("iter_preorder", lambda: sum(1 for _ in root.iter_preorder()))
+    measure("iter_bfs", lambda: sum(1 for _ in root.iter_bfs()))
+    measure("display_tree", lambda: root.display_tree(stream=io.StringIO()))
+    measure("rollup", lambda: [node.rollup("price") for node in nodes])
+    index = {}
+    measure("IndexedServiceTree", lambda: index.setdefault("tree", service_tree.IndexedServiceTree(root, searchable=True)))
+    if "tree" in index:
+        sample = [random.choice(nodes).name for _ in range(1000)]
+        measure("is_under", lambda: [index["tree"].is_under(name, "Root") for name in sample], count=1000)
+        measure("search_complete", lambda: [index["tree"].search.complete(f"Service {i}", 10) for i in range(100)], count=100)
+
+
+def bench_service_loader(n, order, measure):
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write("parent,name,price\n,Service 0,0\n")
+        for i in range(1, n):
+            # Adversarial input is one long chain, which add_child-based loading made O(n * depth)
+            parent = i - 1 if order == "adversarial" else random.randrange(i)
+            file.write(f"Service {parent},Service {i},{i % 100}\n")
+    try:
+        measure("load_service_tree", lambda: service_tree.load_service_tree(path))
+    finally:
+        os.remove(path)
+
+
+def bench_dispatch_queue(n, order, measure):
+    now = [0.0]
+    queue = dispatch_queue.DispatchQueue(aging_seconds=1800, clock=lambda: now[0])
+    # Adversarial intake arrives least urgent first, so every push sifts to the top
+    priorities = [random.randint(1, 5) for _ in range(n)] if order == "random" else [n - i for i in range(n)]
+    ids = []
+
+    def push():
+        for priority in priorities:
+            now[0] += 1
+            ids.append(queue.push({"type": "Oil Change", "priority": priority, "customer": "Customer"}))
+
+    measure("push", push)
+    measure("update_priority", lambda: [queue.update_priority(task_id, 0) for task_id in ids[-1000:]], count=1000)
+    measure("pop", lambda: [queue.pop() for _ in range(n)])
+
+
+SCENARIOS = {
+    "TaskBinaryTree": (bench_task_tree(task_tree.TaskBinaryTree), {"adversarial": QUADRATIC_LIMIT}),
+    "BalancedTaskBinaryTree": (bench_task_tree(task_tree.BalancedTaskBinaryTree), {}),
+    "CompactTaskBinaryTree": (bench_task_tree(task_tree.CompactTaskBinaryTree), {}),
+    "OrderDeque": (bench_order_deque(), {}),
+    "OrderDeque[spill]": (bench_order_deque(max_size=1000, overflow=order_deque.OVERFLOW_SPILL), {}),
+    "T5.SinglyLinkedList": (bench_priority_list(priority_orders.SinglyLinkedList), {}),
+    "T5.BucketedOrderList": (bench_priority_list(priority_orders.BucketedOrderList), {}),
+    "T6.SinglyLinkedList": (bench_cancellation_list, {}),
+    # A chain makes every add_child update rollups along the whole depth
+    "TreeNode": (bench_service_tree, {"adversarial": QUADRATIC_LIMIT}),
+    "load_service_tree": (bench_service_loader, {}),
+    "DispatchQueue": (bench_dispatch_queue, {}),
+}
+
+
+def run_scenario(scenario, n, order, with_memory):
+    """
+    Runs one scenario and returns {operation: result}. With with_memory the
+    scenario runs a second time under tracemalloc to get peak bytes per operation,
+    so tracing doesn't distort the timings.
+    """
+    results = {}
+
+    def timed(operation, function, count=None, max_n=None):
+        if max_n is not None and n > max_n:
+            results[operation] = {"skipped": f"n > {max_n} (quadratic)"}
+            return
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        count = count or n
+        results[operation] = {"seconds": seconds, "per_op_us": seconds / count * 1e6}
+
+    def traced(operation, function, count=None, max_n=None):
+        if max_n is not None and n > max_n:
+            return
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        function()
+        results[operation]["peak_bytes"] = tracemalloc.get_traced_memory()[1] - before
+
+    random.seed(n)
+    scenario(n, order, timed)
+    if with_memory:
+        random.seed(n)
+        tracemalloc.start()
+        try:
+            scenario(n, order, traced)
+        finally:
+            tracemalloc.stop()
+    return results
+
+
+def run(sizes, structures, with_memory):
+    records = []
+    for name in structures:
+        scenario, limits = SCENARIOS[name]
+        for order in ORDERS:
+            for n in sizes:
+                if order in limits and n > limits[order]:
+                    record = {"structure": name, "operation": "*", "order": order, "n": n,
+                              "skipped": f"n > {limits[order]} (quadratic)"}
+                    records.append(record)
+                    print(format_record(record), flush=True)
+                    continue
+                for operation, result in run_scenario(scenario, n, order, with_memory).items():
+                    record = {"structure": name, "operation": operation, "order": order, "n": n}
+                    record.update(result)
+                    records.append(record)
+                    print(format_record(record), flush=True)
+    return records
+
+
+def format_record(record):
+    label = f"{record['structure']:<24} {record['operation']:<28} {record['order']:<11} n={record['n']:<8}"
+    if "skipped" in record:
+        return f"{label} skipped ({record['skipped']})"
+    memory = f"  peak {record['peak_bytes'] / 1024:,.0f} KiB" if "peak_bytes" in record else ""
+    return f"{label} {record['seconds'] * 1000:10.2f} ms  {record['per_op_us']:9.3f} us/op{memory}"
+
+
+def load_baseline(path):
+    """
+    Reads a previous results file into a dict keyed by (structure, operation, order, n).
+    """
+    with open(path, encoding="utf-8") as file:
+        return {(r["structure"], r["operation"], r["order"], r["n"]): r for r in json.load(file)["results"]}
+
+
+def compare(records, baseline, threshold, min_seconds=0.005):
+    """
+    Returns the records that got slower than threshold times their baseline.
+    Very short timings (below min_seconds) are ignored as noise.
+    """
+    regressions = []
+    for record in records:
+        old = baseline.get((record["structure"], record["operation"], record["order"], record["n"]))
+        if not old or "seconds" not in old or "seconds" not in record:
+            continue
+        if record["seconds"] > max(old["seconds"], min_seconds) * threshold:
+            regressions.append((record, old))
+    return regressions
+
+
+# A worker that only processes orders, imported the old way (GUI module) and from the core package
+COLD_START_WORKERS = {
+    "T6 (GUI module)": "import T6; orders = T6.SinglyLinkedList(); orders.add_order('1', 'Customer', 'Oil Change'); orders.remove_order('1')",
+    "core.order_list": "from core.order_list import SinglyLinkedList; orders = SinglyLinkedList(); orders.add_order('1', 'Customer', 'Oil Change'); orders.remove_order('1')",
+}
+
+
+def measure_cold_start(repeats=10):
+    """
+    Times a fresh interpreter running each order-processing worker, and records
+    whether tkinter got imported along the way.
+    """
+    records = []
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name, code in COLD_START_WORKERS.items():
+        check = code + "; import sys; print('tkinter' in sys.modules)"
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", check], cwd=here, capture_output=True, text=True, check=True).stdout
+            timings.append(time.perf_counter() - start)
+        record = {"structure": "cold_start", "operation": name, "order": "-", "n": 1,
+                  "seconds": min(timings), "per_op_us": min(timings) * 1e6, "imports_tkinter": output.strip() == "True"}
+        records.append(record)
+        print(f"cold start {name:<20} {min(timings) * 1000:8.1f} ms (best of {repeats}), imports tkinter: {record['imports_tkinter']}", flush=True)
+    return records
+
+
+# Printed comparison reports, separate from the JSON scaling records
+def benchmark_memory(n=100000):
+    """
+    Measures bytes per task for the dict-backed and compact balanced trees.
+    """
+    task_types = ["Oil Change", "Tire Rotation", "Brake Check", "Engine Diagnosis", "Battery Check"]
+    rows = [(random.choice(task_types), random.randint(1, 100), f"Customer {i % 5000}") for i in range(n)]
+    for tree_class in (task_tree.BalancedTaskBinaryTree, task_tree.CompactTaskBinaryTree):
+        tracemalloc.start()
+        tree = tree_class()
+        for task_type, priority, customer in rows:
+            # Build strings per row, as a file or GUI entry would
+            tree.add_task({"type": "".join(task_type), "priority": priority, "customer": "".join(customer)})
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{tree_class.__name__}: {used / n:.0f} bytes per task")
+        del tree
+
+
+def benchmark_secondary_indexes(n=100000, lookups=1000):
+    """
+    Compares customer/type index lookups against a full in-order scan.
+    """
+    task_types = ["Oil Change", "Tire Rotation", "Brake Check", "Engine Diagnosis", "Battery Check"]
+    tree = task_tree.BalancedTaskBinaryTree()
+    for i in range(n):
+        tree.add_task({"type": random.choice(task_types), "priority": random.randint(1, 100), "customer": f"Customer {i % 5000}"})
+    customers = [f"Customer {random.randrange(5000)}" for _ in range(lookups)]
+
+    start = time.perf_counter()
+    for customer in customers:
+        tree.find_tasks_by_customer(customer)
+    index_time = time.perf_counter() - start
+
+    scan_lookups = max(1, lookups // 100)
+    start = time.perf_counter()
+    for customer in customers[:scan_lookups]:
+        [task for task in tree.iter_tasks() if task['customer'] == customer]
+    scan_time = (time.perf_counter() - start) / scan_lookups * lookups
+
+    print(f"{n} tasks, {lookups} customer lookups")
+    print(f"  index:     {index_time * 1000:.2f} ms")
+    print(f"  full scan: {scan_time * 1000:.2f} ms (extrapolated from {scan_lookups} scans)")
+    print(f"  speedup:   {scan_time / index_time:.0f}x")
+
+
+def benchmark_sorting(sizes=(10000, 100000, 1000000), insertion_sort_limit=20000):
+    """
+    Compares add + insertion_sort on SinglyLinkedList against BucketedOrderList.
+    insertion_sort is quadratic, so above insertion_sort_limit its time is
+    extrapolated from the largest measured size instead of run.
+    """
+    measured = None
+    for size in sizes:
+        priorities = [random.randint(1, 3) for _ in range(size)]
+
+        start = time.perf_counter()
+        bucketed = priority_orders.BucketedOrderList()
+        for i, priority in enumerate(priorities):
+            bucketed.add_order(str(i), "Customer", "Oil Change", priority)
+        bucketed.insertion_sort()
+        bucketed_time = time.perf_counter() - start
+
+        if size <= insertion_sort_limit:
+            start = time.perf_counter()
+            orders = priority_orders.SinglyLinkedList()
+            for i, priority in enumerate(priorities):
+                orders.add_order(str(i), "Customer", "Oil Change", priority)
+            orders.insertion_sort()
+            insertion_time = time.perf_counter() - start
+            measured = (size, insertion_time)
+            label = f"{insertion_time:.2f}s"
+        elif measured:
+            insertion_time = measured[1] * (size / measured[0]) ** 2
+            label = f"~{insertion_time:.0f}s (extrapolated)"
+        else:
+            label = "skipped"
+        print(f"{size:>9} orders: insertion_sort {label}, bucketed {bucketed_time:.3f}s")
+
+
+def benchmark_concurrent(producers=4, consumers=4, orders_per_producer=50000, batch_size=100):
+    """
+    Measures throughput with N producer and M consumer threads, single vs batched operations.
+    """
+    total = producers * orders_per_producer
+    for batched in (False, True):
+        shared = order_deque.ConcurrentOrderDeque(max_size=10000, overflow=order_deque.OVERFLOW_BLOCK)
+        consumed = [0] * consumers
+
+        def produce():
+            orders = [{"order_id": str(i), "customer": "Customer", "service": "Oil Change"} for i in range(orders_per_producer)]
+            if batched:
+                for i in range(0, len(orders), batch_size):
+                    shared.push_many(orders[i:i + batch_size])
+            else:
+                for order in orders:
+                    shared.add_order_rear(order)
+
+        def consume(index):
+            while True:
+                if batched:
+                    batch = shared.pop_many(batch_size, timeout=0.5)
+                    if not batch:
+                        return
+                    consumed[index] += len(batch)
+                else:
+                    if shared.pop_front(timeout=0.5) is None:
+                        return
+                    consumed[index] += 1
+
+        threads = [threading.Thread(target=produce) for _ in range(producers)]
+        threads += [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start - 0.5  # Consumers idle for one timeout before exiting
+        mode = f"batches of {batch_size}" if batched else "single orders"
+        print(f"{producers} producers / {consumers} consumers, {mode}: {sum(consumed)}/{total} orders, {sum(consumed) / elapsed:,.0f} orders/sec")
+
+
+def benchmark_dispatch(technicians=4, orders=400, service_seconds=0.002, skew=0.8):
+    """
+    Compares per-bay deques, work stealing and a single shared deque when most
+    orders land on the first bay.
+    """
+    def handle_order(order):
+        time.sleep(service_seconds)
+
+    def shared_queue_run():
+        shared = order_deque.ConcurrentOrderDeque(max_size=orders)
+        shared.push_many(range(orders))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=technicians) as pool:
+            def work(_):
+                while shared.pop_front(timeout=0) is not None:
+                    handle_order(None)
+            list(pool.map(work, range(technicians)))
+        return time.perf_counter() - start
+
+    assignments = [0 if random.random() < skew else random.randrange(technicians) for _ in range(orders)]
+    for label, steal in (("per-bay, no stealing", False), ("work stealing", True)):
+        dispatcher = order_deque.WorkStealingDispatcher(technicians, handle_order, steal=steal)
+        for i, technician in enumerate(assignments):
+            dispatcher.submit({"order_id": str(i)}, technician)
+        report = dispatcher.run()
+        utilization = ", ".join(f"{stats['utilization']:.0%}/{stats['steals']}" for stats in report["technicians"])
+        print(f"{label}: {orders / report['elapsed_seconds']:,.0f} orders/sec (utilization/steals: {utilization})")
+    print(f"single shared deque: {orders / shared_queue_run():,.0f} orders/sec")
+
+
+def benchmark_dispatch_day(tasks=20000, load=0.9, aging_seconds=1800, escalation_rate=0.03, seed=1):
+    """
+    Replays a synthetic ten-hour day of intake (morning and afternoon peaks) through a
+    DispatchQueue on a simulated clock, with and without aging.
+    Prints queue throughput and waiting times per priority, where an escalated
+    task counts under the priority it was escalated to.
+    :param load: Average share of the technicians' capacity the day's work takes up.
+    :param escalation_rate: Share of arrivals that also escalate a waiting task to priority 1.
+    """
+    random.seed(seed)
+    day = 10 * 3600
+    service_minutes = {"Oil Change": 30, "Tire Rotation": 45, "Brake Check": 60, "Engine Diagnosis": 90, "Battery Check": 20}
+    task_types = list(service_minutes)
+    intake = []
+    for i in range(tasks):
+        # Most cars are dropped off in the morning, with a smaller peak after lunch
+        arrival = day * (random.betavariate(2, 6) if random.random() < 0.65 else random.betavariate(6, 3))
+        task = {"type": random.choice(task_types), "priority": random.choices((1, 2, 3, 4, 5), (5, 15, 30, 30, 20))[0],
+                "customer": f"Customer {i % 5000}"}
+        intake.append((arrival, task))
+    intake.sort(key=lambda item: item[0])
+    escalations = [random.random() < escalation_rate for _ in range(tasks)]
+    total_service = sum(service_minutes[task['type']] * 60 for _, task in intake)
+    technicians = max(1, round(total_service / (day * load)))
+    print(f"{tasks} tasks over a {day // 3600}h day, {technicians} technicians, load {load:.0%}")
+
+    for label, aging in (("no aging", None), (f"aging {aging_seconds}s/level", aging_seconds)):
+        now = [0.0]
+        queue = dispatch_queue.DispatchQueue(aging_seconds=aging, clock=lambda: now[0])
+        free_at = [0.0] * technicians  # heapq of times each technician becomes free
+        waits = {}
+        arrivals = {}
+        priorities = {}  # Task id -> priority it is queued at, including escalations
+        waiting_ids = []  # Recent arrivals still queued, the candidates for escalation
+        escalated = 0
+        chooser = random.Random(seed)  # Same draws in both runs, so they escalate alike
+        peak = 0
+        operations = 0
+        queue_seconds = 0.0
+
+        def dispatch_until(limit):
+            nonlocal operations, queue_seconds
+            while queue and free_at[0] <= limit:
+                now[0] = free_at[0]
+                start = time.perf_counter()
+                task_id, task = queue.pop()
+                queue_seconds += time.perf_counter() - start
+                operations += 1
+                waits.setdefault(priorities.pop(task_id), []).append(now[0] - arrivals.pop(task_id))
+                heapq.heapreplace(free_at, now[0] + service_minutes[task['type']] * 60)
+
+        for (arrival, task), escalate in zip(intake, escalations):
+            dispatch_until(arrival)
+            if free_at[0] < arrival:
+                # Idle technicians wait for this arrival instead of working in the past
+                while free_at[0] < arrival:
+                    heapq.heapreplace(free_at, arrival)
+            now[0] = arrival
+            target = None
+            if escalate:
+                # Only a task that is still waiting below priority 1 can be escalated
+                waiting_ids = [task_id for task_id in waiting_ids if task_id in queue]
+                candidates = [task_id for task_id in waiting_ids if priorities[task_id] > 1]
+                target = chooser.choice(candidates) if candidates else None
+            start = time.perf_counter()
+            task_id = queue.push(task)
+            if target is not None:
+                queue.update_priority(target, 1)
+                operations += 1
+            queue_seconds += time.perf_counter() - start
+            operations += 1
+            if target is not None:
+                priorities[target] = 1
+                escalated += 1
+            arrivals[task_id] = arrival
+            priorities[task_id] = task['priority']
+            waiting_ids.append(task_id)
+            if len(waiting_ids) > 200:
+                waiting_ids = [task_id for task_id in waiting_ids if task_id in queue][-100:]
+            peak = max(peak, len(queue))
+        dispatch_until(float("inf"))
+
+        print(f"{label}: {operations / queue_seconds:,.0f} queue ops/sec, peak queue {peak}, "
+              f"{escalated} escalations, last task dispatched at {now[0] / 3600:.1f}h")
+        for priority in sorted(waits):
+            values = waits[priority]
+            print(f"  priority {priority}: mean wait {sum(values) / len(values) / 60:6.1f} min, "
+                  f"max wait {max(values) / 60:6.1f} min ({len(values)} tasks)")
+
+
+REPORTS = {
+    "memory": benchmark_memory,
+    "secondary_indexes": benchmark_secondary_indexes,
+    "sorting": benchmark_sorting,
+    "concurrent": benchmark_concurrent,
+    "dispatch": benchmark_dispatch,
+    "dispatch_day": benchmark_dispatch_day,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for the car maintenance data structures.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--structures", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--no-cold-start", action="store_true", help="Skip the worker cold-start timings.")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="Previous results JSON to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown factor that counts as a regression.")
+    parser.add_argument("--report", nargs="+", choices=sorted(REPORTS), help="Print these comparison reports instead.")
+    args = parser.parse_args(argv)
+
+    if args.report:
+        for name in args.report:
+            REPORTS[name]()
+        return 0
+
+    # Read before running, since --output may well name the same file as --compare
+    baseline = load_baseline(args.compare) if args.compare else None
+    records = run(args.sizes, args.structures, not args.no_memory)
+    if not args.no_cold_start:
+        records += measure_cold_start()
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"python": sys.version.split()[0], "platform": platform.platform(),
+                   "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": records}, file, indent=1)
+    print(f"Wrote {len(records)} results to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(records, baseline, args.threshold)
+        for record, old in regressions:
+            print(f"REGRESSION {format_record(record)} (was {old['seconds'] * 1000:.2f} ms)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Headless data structures for the car maintenance service, with no GUI dependency.
+
+Submodules are imported on first attribute access, so a worker that only needs
+order lists doesn't pay for the task tree, the deque or the service catalog.
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "TaskBinaryTree": "task_tree",
+    "BalancedTaskBinaryTree": "task_tree",
+    "CompactTaskBinaryTree": "task_tree",
+    "read_task_file": "task_tree",
+    "OrderDeque": "order_deque",
+    "ConcurrentOrderDeque": "order_deque",
+    "OrderWriteAheadLog": "order_deque",
+    "WorkStealingDispatcher": "order_deque",
+    "OVERFLOW_REJECT": "order_deque",
+    "OVERFLOW_BLOCK": "order_deque",
+    "OVERFLOW_EVICT": "order_deque",
+    "OVERFLOW_SPILL": "order_deque",
+    "TreeNode": "service_tree",
+    "IndexedServiceTree": "service_tree",
+    "ServiceSearchIndex": "service_tree",
+    "create_service_tree": "service_tree",
+    "load_service_tree": "service_tree",
+    "BucketedOrderList": "priority_orders",
+    "merge_sort_nodes": "priority_orders",
+    "SnapshotStore": "storage",
+    "MetricsRegistry": "metrics",
+    "BackgroundJob": "background",
+    "DispatchQueue": "dispatch_queue",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,271 @@
+"""
+Runs expensive structure operations off the Tk main loop.
+
+A BackgroundJob runs a generator function on a worker thread, and the main loop
+polls for its results with root.after, a batch at a time. Tk calls stay on the
+main thread, and the window keeps handling events between batches.
+
+A thread pool is used rather than a process pool because the jobs work on the
+structures the window already holds. Sending a million-node list to another
+process and back would cost more than the operation itself.
+"""
+import queue
+import threading
+import time
+import weakref
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class DaemonThreadPool:
+    """
+    Minimal pool of daemon worker threads.
+    Unlike ThreadPoolExecutor, whose workers are joined at interpreter exit, a job
+    still running when the window closes can't keep the process alive.
+    """
+
+    def __init__(self, workers=2, name="gui-worker"):
+        self.tasks = queue.SimpleQueue()
+        for index in range(workers):
+            threading.Thread(target=self._work, name=f"{name}_{index}", daemon=True).start()
+
+    def _work(self):
+        while True:
+            self.tasks.get()()
+
+    def submit(self, function):
+        self.tasks.put(function)
+
+
+def shared_executor():
+    """
+    Returns the worker pool shared by every job that isn't given its own executor.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DaemonThreadPool()
+        return _executor
+
+
+# Root -> jobs started on it, so closing the window can cancel whatever is still running
+_jobs_by_root = weakref.WeakKeyDictionary()
+
+
+def _watch_root(root):
+    jobs = _jobs_by_root.get(root)
+    if jobs is None:
+        jobs = _jobs_by_root[root] = weakref.WeakSet()
+        if hasattr(root, "bind"):
+            def on_destroy(event):
+                # Destroy is also reported for every child widget; only the root going away matters
+                if event.widget is root:
+                    for job in list(jobs):
+                        job.cancel()
+            root.bind("<Destroy>", on_destroy, add="+")
+    return jobs
+
+
+class BackgroundJob:
+    """
+    Streams the items yielded by work(job) from a worker thread to on_batch on the main loop.
+    The worker checks job.cancelled between items, so a long job stops at its next yield.
+    """
+
+    def __init__(self, work, on_batch, on_done=None, on_progress=None,
+                 batch_size=500, interval_ms=30, executor=None):
+        """
+        :param work: Function called with the job on the worker thread; returns an iterable of items.
+                     It can set job.total so progress has something to count towards.
+        :param on_batch: Called on the main loop with each list of items.
+        :param on_done: Called on the main loop with the job once it has finished, failed or been cancelled.
+        :param on_progress: Called on the main loop with (items delivered so far, job.total or None).
+        :param batch_size: Most items handed to on_batch at once.
+        :param interval_ms: Delay between polls of the worker's results.
+        :param executor: Pool to run on (defaults to shared_executor()).
+        """
+        self.work = work
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.batch_size = batch_size
+        self.interval_ms = interval_ms
+        self.executor = executor
+        self.total = None
+        self.delivered = 0
+        self.error = None
+        self.finished = False
+        # Bounded, so a worker that outpaces the UI waits instead of buffering everything
+        self.results = queue.Queue(maxsize=64)
+        self._cancel_event = threading.Event()
+        self._worker_finished = threading.Event()
+        self.root = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        Stops the job; batches the worker already produced are dropped.
+        """
+        self._cancel_event.set()
+
+    def start(self, root):
+        """
+        Submits the job and starts polling for results from root's event loop.
+        The job is cancelled if root is destroyed before it finishes.
+        :param root: Tk root (anything with an after(ms, callback) method).
+        """
+        self.root = root
+        _watch_root(root).add(self)
+        (self.executor or shared_executor()).submit(self._run)
+        root.after(self.interval_ms, self._poll)
+        return self
+
+    def _put(self, item):
+        # Returns False if the job was cancelled while waiting for room in the queue
+        while not self.cancelled:
+            try:
+                self.results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        batch = []
+        items = None
+        try:
+            items = iter(self.work(self))
+            flushed_at = time.perf_counter()
+            for item in items:
+                if self.cancelled:
+                    return
+                batch.append(item)
+                # Flush on size, or on time so a slow producer still shows progress
+                if len(batch) >= self.batch_size or time.perf_counter() - flushed_at > self.interval_ms / 1000:
+                    if not self._put(batch):
+                        return
+                    batch = []
+                    flushed_at = time.perf_counter()
+            if batch:
+                self._put(batch)
+        except Exception as error:
+            self.error = error
+        finally:
+            if hasattr(items, "close"):
+                items.close()
+            # An event rather than a marker in the queue, so finishing never blocks on a full queue
+            self._worker_finished.set()
+
+    def _poll(self):
+        # Hand over batches for at most one frame's worth of time, then yield to Tk
+        deadline = time.perf_counter() + 0.016
+        worker_done = False
+        while time.perf_counter() < deadline:
+            try:
+                batch = self.results.get_nowait()
+            except queue.Empty:
+                # Checked in this order because the worker sets the event after its last put
+                worker_done = self._worker_finished.is_set() and self.results.empty()
+                break
+            if not self.cancelled:
+                self.on_batch(batch)
+                self.delivered += len(batch)
+        if self.on_progress and not self.cancelled:
+            self.on_progress(self.delivered, self.total)
+        if worker_done or (self.cancelled and self._drain_until_done()):
+            self.finished = True
+            if self.on_done:
+                self.on_done(self)
+        else:
+            self.root.after(self.interval_ms, self._poll)
+
+    def _drain_until_done(self):
+        # After cancel, discard pending batches so a worker waiting for room can notice and stop
+        worker_done = self._worker_finished.is_set()
+        while True:
+            try:
+                self.results.get_nowait()
+            except queue.Empty:
+                return worker_done
+
+
+class TextStream:
+    """
+    Streams lines from a BackgroundJob into a Tk Text widget, one listing at a time,
+    with a status label, a cancel button and widgets that are disabled while it runs.
+    Starting a new listing cancels the one still streaming.
+    Only widget methods are used, so this module stays importable without tkinter.
+    """
+
+    def __init__(self, root, text, status_label, cancel_button, busy_widgets=(), noun="items", on_error=None):
+        """
+        :param text: Text widget the lines are appended to.
+        :param cancel_button: Button that cancels the listing; enabled only while one runs.
+        :param busy_widgets: Widgets to disable while a listing runs, e.g. buttons that change the structure.
+        :param noun: What the lines are, for the status messages ("tasks", "orders").
+        :param on_error: Called with the exception if the work fails.
+        """
+        self.root = root
+        self.text = text
+        self.status_label = status_label
+        self.cancel_button = cancel_button
+        self.busy_widgets = busy_widgets
+        self.noun = noun
+        self.on_error = on_error
+        self.job = None
+        cancel_button.config(command=self.cancel, state="disabled")
+
+    def start(self, work, status, on_done=None):
+        """
+        Clears the text widget and streams the lines yielded by work(job) into it.
+        :param work: Function called with the job on the worker thread; returns the lines (without newlines).
+        :param status: Status shown while the listing runs, e.g. "Loading orders...".
+        :param on_done: Called with the job once the listing has finished, failed or been cancelled.
+        """
+        self.cancel()
+        self.text.delete("1.0", "end")
+        self.set_busy(True)
+        self.status_label.config(text=status)
+
+        def progress(delivered, total):
+            if delivered:
+                self.status_label.config(text=f"{status} {delivered} {self.noun} shown")
+
+        def done(job):
+            if job is not self.job:
+                return  # Superseded by a newer listing, which owns the widgets now
+            self.job = None
+            self.set_busy(False)
+            if job.error is not None:
+                self.status_label.config(text="")
+                if self.on_error:
+                    self.on_error(job.error)
+                return
+            if job.cancelled:
+                self.status_label.config(text=f"Cancelled after {job.delivered} {self.noun}.")
+            else:
+                self.status_label.config(text=f"{job.delivered} {self.noun}.")
+                if job.delivered == 0:
+                    self.text.insert("end", f"No {self.noun} available.")
+            if on_done:
+                on_done(job)
+
+        self.job = BackgroundJob(work, self.append_lines, on_done=done, on_progress=progress)
+        return self.job.start(self.root)
+
+    def append_lines(self, lines):
+        # One Tk call per batch rather than one per line
+        self.text.insert("end", "".join(f"{line}\n" for line in lines))
+
+    def set_busy(self, busy):
+        for widget in self.busy_widgets:
+            widget.config(state="disabled" if busy else "normal")
+        self.cancel_button.config(state="normal" if busy else "disabled")
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
@@ -0,0 +1,169 @@
+import itertools
+import time
+
+
+class DispatchQueue:
+    """
+    Indexed binary min-heap of task dicts ({"type", "priority", "customer"}) for
+    handing out the most urgent task next. Lower priority values are more urgent,
+    as in the task tree, and equal priorities are served first come, first served.
+
+    push, pop, update_priority and remove are O(log n); the task id -> heap slot
+    index is what makes update_priority and remove possible without a scan.
+
+    With aging, every aging_seconds a task waits makes it one priority level more
+    urgent. Since all waiting tasks age at the same rate, that ordering is fixed
+    when a task is pushed (priority + enqueue time / aging_seconds), so aging
+    never needs the heap to be reordered.
+    """
+
+    def __init__(self, aging_seconds=None, clock=time.monotonic):
+        """
+        :param aging_seconds: Waiting time that counts as one priority level, or None for no aging.
+        :param clock: Function returning the current time in seconds (e.g. a simulated clock).
+        """
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+        self.started_at = clock()  # Keys are relative to this, so floats keep their precision
+        self.heap = []       # Entries: [(key, sequence), task_id, task, priority, enqueued_at]
+        self.position = {}   # task_id -> index of its entry in self.heap
+        self.sequence = itertools.count()
+        self.next_id = itertools.count(1)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, task_id):
+        return task_id in self.position
+
+    def _key(self, priority, enqueued_at):
+        if self.aging_seconds is None:
+            return priority
+        return priority + (enqueued_at - self.started_at) / self.aging_seconds
+
+    def push(self, task, task_id=None):
+        """
+        Queues a task by its "priority".
+        :param task_id: Id to re-prioritize or remove the task by later (one is generated if not given).
+        :return: The task id, or None if a task with this id is already queued.
+        """
+        if task_id is None:
+            task_id = next(self.next_id)
+        elif task_id in self.position:
+            return None
+        priority = task['priority']
+        enqueued_at = self.clock()
+        entry = [(self._key(priority, enqueued_at), next(self.sequence)), task_id, task, priority, enqueued_at]
+        self.heap.append(entry)
+        self.position[task_id] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+        return task_id
+
+    def peek(self):
+        """
+        Returns (task_id, task) for the most urgent task without removing it, or None if empty.
+        """
+        if not self.heap:
+            return None
+        entry = self.heap[0]
+        return entry[1], entry[2]
+
+    def pop(self):
+        """
+        Removes and returns (task_id, task) for the most urgent task, or None if empty.
+        """
+        if not self.heap:
+            return None
+        entry = self._remove_at(0)
+        return entry[1], entry[2]
+
+    def remove(self, task_id):
+        """
+        Removes a queued task, e.g. when the customer cancels. Returns the task or None.
+        """
+        index = self.position.get(task_id)
+        if index is None:
+            return None
+        return self._remove_at(index)[2]
+
+    def update_priority(self, task_id, priority):
+        """
+        Re-prioritizes a queued task in O(log n), keeping the time it has already waited.
+        :return: False if no task with this id is queued.
+        """
+        index = self.position.get(task_id)
+        if index is None:
+            return False
+        entry = self.heap[index]
+        old_key = entry[0]
+        entry[0] = (self._key(priority, entry[4]), old_key[1])
+        entry[3] = priority
+        if entry[0] < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+        return True
+
+    def effective_priority(self, task_id):
+        """
+        Returns the task's priority after aging, as of now, or None if it isn't queued.
+        """
+        index = self.position.get(task_id)
+        if index is None:
+            return None
+        entry = self.heap[index]
+        if self.aging_seconds is None:
+            return entry[3]
+        return entry[3] - (self.clock() - entry[4]) / self.aging_seconds
+
+    def _remove_at(self, index):
+        heap = self.heap
+        entry = heap[index]
+        del self.position[entry[1]]
+        last = heap.pop()
+        if index < len(heap):
+            # Fill the hole with the last entry and move it whichever way restores the heap
+            heap[index] = last
+            self.position[last[1]] = index
+            if last[0] < entry[0]:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+        return entry
+
+    def _sift_up(self, index):
+        heap = self.heap
+        position = self.position
+        entry = heap[index]
+        key = entry[0]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if key >= parent[0]:
+                break
+            heap[index] = parent
+            position[parent[1]] = index
+            index = parent_index
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def _sift_down(self, index):
+        heap = self.heap
+        position = self.position
+        size = len(heap)
+        entry = heap[index]
+        key = entry[0]
+        child_index = 2 * index + 1
+        while child_index < size:
+            right_index = child_index + 1
+            if right_index < size and heap[right_index][0] < heap[child_index][0]:
+                child_index = right_index
+            child = heap[child_index]
+            if key <= child[0]:
+                break
+            heap[index] = child
+            position[child[1]] = index
+            index = child_index
+            child_index = 2 * index + 1
+        heap[index] = entry
+        position[entry[1]] = index
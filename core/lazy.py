@@ -0,0 +1,19 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+    The GUI front-ends (T2-T6) bind tk and its submodules this way, so tkinter is only
+    imported once a window is built. Their structures and helpers can then be imported
+    and tested on machines without a display or a Tk installation.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
@@ -0,0 +1,494 @@
+"""
+Opt-in per-operation metrics for the core data structures.
+
+Nothing is instrumented until enable() is called: it swaps the public methods of
+TaskBinaryTree, OrderDeque, both SinglyLinkedLists and TreeNode for timing
+wrappers, and disable() puts the original functions back, so a process that
+never enables metrics runs exactly the same code as before.
+
+Every wrapped call records a call count, an error count and a latency histogram,
+plus structure-specific signals such as BST search depth, linked-list nodes
+visited or deque evictions. Signals that need an extra walk of the structure
+are measured after the timed call, so they don't inflate the latency numbers.
+"""
+import bisect
+import inspect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3,
+                   2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the histogram buckets used for depths, lengths and counts
+COUNT_BUCKETS = tuple(2 ** power for power in range(21))
+
+METRIC_PREFIX = "cms"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is the +Inf bucket
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of call counts and histograms, keyed by (structure, method).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.errors = {}
+        self.latency = {}
+        self.signals = {}  # (structure, method, signal) -> Histogram
+
+    def record_call(self, structure, method, seconds, failed=False):
+        key = (structure, method)
+        with self.lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            if failed:
+                self.errors[key] = self.errors.get(key, 0) + 1
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe(self, structure, method, signal, value):
+        key = (structure, method, signal)
+        with self.lock:
+            histogram = self.signals.get(key)
+            if histogram is None:
+                histogram = self.signals[key] = Histogram(COUNT_BUCKETS)
+            histogram.observe(value)
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.errors.clear()
+            self.latency.clear()
+            self.signals.clear()
+
+    def to_dict(self):
+        """
+        Returns every metric as nested dicts: structure -> method -> values.
+        """
+        result = {}
+        with self.lock:
+            for (structure, method), calls in self.calls.items():
+                result.setdefault(structure, {})[method] = {
+                    "calls": calls,
+                    "errors": self.errors.get((structure, method), 0),
+                    "latency_seconds": self.latency[(structure, method)].to_dict(),
+                    "signals": {},
+                }
+            for (structure, method, signal), histogram in self.signals.items():
+                entry = result.setdefault(structure, {}).setdefault(method, {"calls": 0, "errors": 0, "signals": {}})
+                entry["signals"][signal] = histogram.to_dict()
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self.lock:
+            calls = sorted(self.calls.items())
+            errors = dict(self.errors)
+            latency = sorted(self.latency.items())
+            signals = {}
+            for (structure, method, signal), histogram in sorted(self.signals.items()):
+                signals.setdefault(signal, []).append(((structure, method), histogram.to_dict()))
+            latency = [(key, histogram.to_dict()) for key, histogram in latency]
+
+        lines.append(f"# HELP {METRIC_PREFIX}_calls_total Calls per structure method.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_calls_total counter")
+        for key, count in calls:
+            lines.append(f"{METRIC_PREFIX}_calls_total{{{_labels(*key)}}} {count}")
+        lines.append(f"# HELP {METRIC_PREFIX}_errors_total Calls that raised an exception.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_errors_total counter")
+        for key, _ in calls:
+            lines.append(f"{METRIC_PREFIX}_errors_total{{{_labels(*key)}}} {errors.get(key, 0)}")
+        _histogram_lines(lines, f"{METRIC_PREFIX}_call_seconds", "Latency of structure method calls.", latency)
+        for signal, histograms in signals.items():
+            _histogram_lines(lines, f"{METRIC_PREFIX}_{signal}", f"Per-call {signal.replace('_', ' ')}.", histograms)
+        return "\n".join(lines) + "\n"
+
+
+def _labels(structure, method):
+    return f'structure="{structure}",method="{method}"'
+
+
+def _histogram_lines(lines, name, help_text, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in histograms:
+        labels = _labels(*key)
+        for bound, count in histogram["buckets"].items():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram['sum']}")
+        lines.append(f"{name}_count{{{labels}}} {histogram['count']}")
+
+
+registry = MetricsRegistry()
+
+
+# Signal probes: probe(structure, args, kwargs, result, before) -> {signal: value} or None.
+# "before" is whatever the spec's pre-call function returned.
+
+def _argument(args, kwargs, name, position=0):
+    return args[position] if len(args) > position else kwargs.get(name)
+
+
+def _tree_path_length(tree, priority, stop_on_equal):
+    length = 0
+    node = tree.root
+    while node is not None:
+        length += 1
+        if stop_on_equal and node.priority == priority:
+            break
+        node = node.left if priority < node.priority else node.right
+    return length
+
+
+def _insert_depth(tree, args, kwargs, result, before):
+    return {"insert_depth": _tree_path_length(tree, _argument(args, kwargs, "task")['priority'], False)}
+
+
+def _search_depth(tree, args, kwargs, result, before):
+    return {"search_depth": _tree_path_length(tree, _argument(args, kwargs, "priority"), True)}
+
+
+def _results(structure, args, kwargs, result, before):
+    return {"results": len(result)}
+
+
+def _nodes_visited(structure, args, kwargs, result, before):
+    return {"nodes_visited": len(result)}
+
+
+def _rows(tree, args, kwargs, result, before):
+    return {"rows": result["rows"]}
+
+
+def _deque_added(deque, args, kwargs, result, before):
+    signals = {"deque_length": len(deque)}
+    if deque.evicted_count > before:
+        signals["evictions"] = deque.evicted_count - before
+    if result is False or result == 0:
+        signals["rejections"] = 1
+    return signals
+
+
+def _deque_length(deque, args, kwargs, result, before):
+    return {"deque_length": len(deque)}
+
+
+def _evicted_count(deque, args, kwargs):
+    return deque.evicted_count
+
+
+def _index_bucket(orders, args, kwargs):
+    return len(orders.index.get(_argument(args, kwargs, "order_id"), ()))
+
+
+def _index_bucket_size(orders, args, kwargs, result, before):
+    return {"index_bucket_size": before}
+
+
+def _sorted_insert_scan(orders, args, kwargs, result, before):
+    # Position of the inserted node is how far the scan had to walk
+    visited = 0
+    node = result
+    new_node = _argument(args, kwargs, "new_node", 1)
+    while node is not None and node is not new_node:
+        visited += 1
+        node = node.next
+    return {"nodes_visited": visited}
+
+
+def _tail(orders, args, kwargs):
+    return orders.tail
+
+
+def _orders_loaded(orders, args, kwargs, result, before):
+    loaded = 0
+    node = orders.head if before is None else before.next
+    while node is not None:
+        loaded += 1
+        node = node.next
+    return {"orders_loaded": loaded}
+
+
+def _list_length(orders, args, kwargs, result, before):
+    length = 0
+    node = orders.head
+    while node is not None:
+        length += 1
+        node = node.next
+    return {"list_length": length}
+
+
+def _ancestors_updated(node, args, kwargs, result, before):
+    depth = 0
+    while node is not None:
+        depth += 1
+        node = node.parent
+    return {"ancestors_updated": depth}
+
+
+def _subtree_size(node, args, kwargs, result, before):
+    return {"nodes_visited": node.subtree_size}
+
+
+# (class loader, {method: (probe, pre-call function)}); subclass overrides are wrapped too.
+# Generator methods are timed across the whole iteration and report items_yielded;
+# coroutine methods are timed until they return, including any wait for an order.
+def _targets():
+    from core import order_deque, order_list, priority_orders, service_tree, task_tree
+    return (
+        (task_tree.TaskBinaryTree, {
+            "add_task": (_insert_depth, None),
+            "get_tasks_in_priority_order": (_nodes_visited, None),
+            "iter_tasks": (None, None),
+            "tasks_in_range": (None, None),
+            "find_task": (_search_depth, None),
+            "find_tasks": (_results, None),
+            "find_tasks_by_customer": (_results, None),
+            "find_tasks_by_type": (_results, None),
+            "bulk_load": (_rows, None),
+        }),
+        (order_deque.OrderDeque, {
+            "add_order_front": (_deque_added, _evicted_count),
+            "add_order_rear": (_deque_added, _evicted_count),
+            "remove_order_front": (_deque_length, None),
+            "remove_order_rear": (_deque_length, None),
+            "push_many": (_deque_added, _evicted_count),
+            "pop_front": (_deque_length, None),
+            "pop_rear": (_deque_length, None),
+            "pop_many": (_results, None),
+            "pop_front_async": (_deque_length, None),
+            "pop_rear_async": (_deque_length, None),
+            "display_orders": (_results, None),
+            "orders_window": (_results, None),
+        }),
+        (order_list.SinglyLinkedList, {
+            "load_orders": (_orders_loaded, _tail),
+            "add_order": (None, None),
+            "has_order": (None, None),
+            "find_order": (_index_bucket_size, _index_bucket),
+            "remove_order": (_index_bucket_size, _index_bucket),
+            "remove_many": (None, None),
+            "update_order": (_index_bucket_size, _index_bucket),
+            "iter_orders": (None, None),
+            "iter_order_nodes": (None, None),
+            "display_orders": (_nodes_visited, None),
+        }),
+        (priority_orders.SinglyLinkedList, {
+            "add_order": (None, None),
+            "insertion_sort": (_list_length, None),
+            "sorted_insert": (_sorted_insert_scan, None),
+            "merge_sort": (_list_length, None),
+            "iter_orders": (None, None),
+            "display_orders": (_nodes_visited, None),
+        }),
+        (service_tree.TreeNode, {
+            "add_child": (_ancestors_updated, None),
+            "set_attribute": (_ancestors_updated, None),
+            "path": (_results, None),
+            "rollup": (None, None),
+            "display_tree": (_subtree_size, None),
+            "iter_preorder": (None, None),
+            "iter_bfs": (None, None),
+        }),
+    )
+
+
+_patched = []  # (class, method name, original function) while enabled
+_structure_names = {}
+
+
+def _structure_name(cls):
+    # Module-qualified, since both order lists are called SinglyLinkedList
+    name = _structure_names.get(cls)
+    if name is None:
+        name = _structure_names[cls] = f"{cls.__module__.rsplit('.', 1)[-1]}.{cls.__name__}"
+    return name
+
+
+def _wrap(name, original, probe, before_call, target):
+    def wrapper(self, *args, **kwargs):
+        cls = type(self)
+        if getattr(cls, name) is not wrapper:
+            # Reached through super() from an instrumented override, which already counts it
+            return original(self, *args, **kwargs)
+        before = before_call(self, args, kwargs) if before_call else None
+        start = time.perf_counter()
+        try:
+            result = original(self, *args, **kwargs)
+        except BaseException:
+            target.record_call(_structure_name(cls), name, time.perf_counter() - start, failed=True)
+            raise
+        target.record_call(_structure_name(cls), name, time.perf_counter() - start)
+        if probe is not None:
+            signals = probe(self, args, kwargs, result, before)
+            if signals:
+                structure = _structure_name(cls)
+                for signal, value in signals.items():
+                    target.observe(structure, name, signal, value)
+        return result
+
+    def generator_wrapper(self, *args, **kwargs):
+        cls = type(self)
+        if getattr(cls, name) is not generator_wrapper:
+            yield from original(self, *args, **kwargs)
+            return
+        elapsed = 0.0
+        count = 0
+        failed = False
+        iterator = original(self, *args, **kwargs)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    return
+                except BaseException:
+                    elapsed += time.perf_counter() - start
+                    failed = True
+                    raise
+                elapsed += time.perf_counter() - start
+                count += 1
+                yield item
+        finally:
+            iterator.close()
+            structure = _structure_name(cls)
+            target.record_call(structure, name, elapsed, failed=failed)
+            target.observe(structure, name, "items_yielded", count)
+
+    async def coroutine_wrapper(self, *args, **kwargs):
+        cls = type(self)
+        if getattr(cls, name) is not coroutine_wrapper:
+            return await original(self, *args, **kwargs)
+        before = before_call(self, args, kwargs) if before_call else None
+        start = time.perf_counter()
+        try:
+            result = await original(self, *args, **kwargs)
+        except BaseException:
+            target.record_call(_structure_name(cls), name, time.perf_counter() - start, failed=True)
+            raise
+        target.record_call(_structure_name(cls), name, time.perf_counter() - start)
+        if probe is not None:
+            signals = probe(self, args, kwargs, result, before)
+            if signals:
+                structure = _structure_name(cls)
+                for signal, value in signals.items():
+                    target.observe(structure, name, signal, value)
+        return result
+
+    if inspect.isgeneratorfunction(original):
+        chosen = generator_wrapper
+    elif inspect.iscoroutinefunction(original):
+        chosen = coroutine_wrapper
+    else:
+        chosen = wrapper
+    chosen.__name__ = original.__name__
+    chosen.__qualname__ = original.__qualname__
+    chosen.__doc__ = original.__doc__
+    chosen.__wrapped__ = original
+    return chosen
+
+
+def _subclasses(cls):
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_subclasses(subclass))
+    return classes
+
+
+def enable(target=None):
+    """
+    Starts recording metrics for every instrumented method.
+    :param target: MetricsRegistry to record into (defaults to the module-level registry).
+    """
+    global registry
+    if _patched:
+        return
+    if target is not None:
+        registry = target
+    for base, methods in _targets():
+        for cls in _subclasses(base):
+            for name, (probe, before_call) in methods.items():
+                original = cls.__dict__.get(name)
+                if original is None or not inspect.isfunction(original):
+                    continue
+                setattr(cls, name, _wrap(name, original, probe, before_call, registry))
+                _patched.append((cls, name, original))
+
+
+def disable():
+    """
+    Restores the original methods; recorded metrics are kept.
+    """
+    while _patched:
+        cls, name, original = _patched.pop()
+        setattr(cls, name, original)
+
+
+def is_enabled():
+    return bool(_patched)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = registry.to_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body = registry.to_json().encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes would otherwise print a line to stderr every few seconds
+        pass
+
+
+def serve(port=9464, host="127.0.0.1"):
+    """
+    Serves /metrics (Prometheus text) and /metrics.json from a daemon thread.
+    :param port: TCP port, or 0 to pick a free one (see server.server_address).
+    :return: The running server; call shutdown() on it to stop.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
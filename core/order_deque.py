@@ -0,0 +1,655 @@
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from collections import deque
+from itertools import islice
+
+# What add_order_front/add_order_rear do when the deque already holds max_size orders
+OVERFLOW_REJECT = "reject"  # Refuse the new order and return False
+OVERFLOW_BLOCK = "block"    # Wait until another thread removes an order
+OVERFLOW_EVICT = "evict"    # Drop the order at the opposite end and report it
+OVERFLOW_SPILL = "spill"    # Keep max_size orders in memory and the rest on disk
+
+# The spill segment is compacted once its dead (already popped) records take up more
+# bytes than the live ones and more than this
+SPILL_COMPACT_BYTES = 1 << 16
+
+
+class OrderSpillFile:
+    """
+    Disk-backed deque of orders used by the spill policy.
+    Orders are appended as JSON records to a memory-mapped segment file; only
+    their offsets and lengths stay in memory, in two typed arrays per end.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w+b")
+        self.map = None
+        self.size = 0
+        self.live_bytes = 0  # Bytes of the segment still holding unread orders
+        # Orders pushed at the front form a stack (last item = front); the ones
+        # pushed at the rear form a list read from rear_head onwards.
+        self.front_offsets, self.front_lengths, self.front_bottom = array("q"), array("q"), 0
+        self.rear_offsets, self.rear_lengths, self.rear_head = array("q"), array("q"), 0
+
+    def __len__(self):
+        return (len(self.front_offsets) - self.front_bottom) + (len(self.rear_offsets) - self.rear_head)
+
+    def _write(self, order):
+        data = json.dumps(order).encode("utf-8")
+        offset = self.size
+        self.file.write(data)  # The file position always sits at the end of the segment
+        self.size += len(data)
+        self.live_bytes += len(data)
+        return offset, len(data)
+
+    def _raw(self, offset, length):
+        if self.map is None or offset + length > len(self.map):
+            self.file.flush()
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), self.size, access=mmap.ACCESS_READ)
+        return self.map[offset:offset + length]
+
+    def _read(self, offset, length):
+        return json.loads(self._raw(offset, length))
+
+    def _consume(self, offset, length):
+        # Reads an order that is being popped and accounts for its bytes going dead
+        order = self._read(offset, length)
+        self.live_bytes -= length
+        return order
+
+    def push_front(self, order):
+        offset, length = self._write(order)
+        self.front_offsets.append(offset)
+        self.front_lengths.append(length)
+
+    def push_rear(self, order):
+        offset, length = self._write(order)
+        self.rear_offsets.append(offset)
+        self.rear_lengths.append(length)
+
+    def pop_front(self):
+        if len(self.front_offsets) > self.front_bottom:
+            order = self._consume(self.front_offsets.pop(), self.front_lengths.pop())
+        else:
+            order = self._consume(self.rear_offsets[self.rear_head], self.rear_lengths[self.rear_head])
+            self.rear_head += 1
+        self._reclaim()
+        return order
+
+    def pop_rear(self):
+        if len(self.rear_offsets) > self.rear_head:
+            order = self._consume(self.rear_offsets.pop(), self.rear_lengths.pop())
+        else:
+            order = self._consume(self.front_offsets[self.front_bottom], self.front_lengths[self.front_bottom])
+            self.front_bottom += 1
+        self._reclaim()
+        return order
+
+    def __getitem__(self, index):
+        front_count = len(self.front_offsets) - self.front_bottom
+        if index < front_count:
+            i = len(self.front_offsets) - 1 - index
+            return self._read(self.front_offsets[i], self.front_lengths[i])
+        i = self.rear_head + index - front_count
+        return self._read(self.rear_offsets[i], self.rear_lengths[i])
+
+    def __iter__(self):
+        for i in range(len(self.front_offsets) - 1, self.front_bottom - 1, -1):
+            yield self._read(self.front_offsets[i], self.front_lengths[i])
+        for i in range(self.rear_head, len(self.rear_offsets)):
+            yield self._read(self.rear_offsets[i], self.rear_lengths[i])
+
+    def _reclaim(self):
+        """
+        Keeps disk and memory proportional to the orders still spilled, not to how many
+        have passed through: the segment is rewritten once dead records dominate it.
+        """
+        dead_bytes = self.size - self.live_bytes
+        if len(self) == 0 or (dead_bytes > SPILL_COMPACT_BYTES and dead_bytes > self.live_bytes):
+            self._compact()
+
+    def _compact(self):
+        # Copy the live records, in deque order, to the start of the segment
+        records = []
+        for i in range(len(self.front_offsets) - 1, self.front_bottom - 1, -1):
+            records.append(self._raw(self.front_offsets[i], self.front_lengths[i]))
+        for i in range(self.rear_head, len(self.rear_offsets)):
+            records.append(self._raw(self.rear_offsets[i], self.rear_lengths[i]))
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.seek(0)
+        self.file.truncate(0)
+        # Everything live becomes the rear list; the front stack starts empty again
+        self.front_offsets, self.front_lengths, self.front_bottom = array("q"), array("q"), 0
+        self.rear_offsets, self.rear_lengths, self.rear_head = array("q"), array("q"), 0
+        self.size = self.live_bytes = 0
+        for data in records:
+            self.rear_offsets.append(self.size)
+            self.rear_lengths.append(len(data))
+            self.file.write(data)
+            self.size += len(data)
+            self.live_bytes += len(data)
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+        os.remove(self.path)
+
+# Append-only log of deque operations with group commit and periodic snapshots
+class OrderWriteAheadLog:
+    def __init__(self, path, fsync_batch=100, fsync_interval=1.0, snapshot_every=100000):
+        """
+        :param path: Log file; the snapshot is kept next to it as path + ".snapshot".
+        :param fsync_batch: fsync after this many records (1 makes every operation durable).
+        :param fsync_interval: Also fsync this many seconds after the first record that isn't synced yet.
+        :param snapshot_every: Write a snapshot and truncate the log after this many records.
+        Every record is flushed to the OS as it is appended, so only a machine crash,
+        not a process crash, can lose the records since the last fsync.
+        """
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.pending = 0
+        self.records_since_snapshot = 0
+        self.file = None
+        self.lock = threading.Lock()  # The interval fsync runs on a timer thread
+        self.timer = None
+
+    def recover(self):
+        """
+        Yields the snapshot orders as ("add_rear", order) followed by the logged
+        operations made after it. A torn record at the end of the log is ignored.
+        """
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot_seq = json.loads(file.readline())["seq"]
+                for line in file:
+                    yield "add_rear", json.loads(line)
+        self.seq = snapshot_seq
+        if os.path.exists(self.path):
+            valid_bytes = 0
+            with open(self.path, "rb") as file:
+                for line in file:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("record was cut off")
+                        seq, operation, order = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    # Records at or below the snapshot's seq are already in the snapshot
+                    if seq > snapshot_seq:
+                        self.seq = seq
+                        self.records_since_snapshot += 1
+                        yield operation, order
+            # Drop the torn tail, or the next record would be appended onto it and lost too
+            if os.path.getsize(self.path) > valid_bytes:
+                with open(self.path, "r+b") as file:
+                    file.truncate(valid_bytes)
+
+    def append(self, operation, order=None):
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.seq += 1
+            self.file.write(json.dumps([self.seq, operation, order]) + "\n")
+            self.file.flush()
+            self.pending += 1
+            self.records_since_snapshot += 1
+            if self.pending >= self.fsync_batch:
+                self._sync()
+            elif self.timer is None:
+                # Bounds how long a record can wait for fsync even if no more records come
+                self.timer = threading.Timer(self.fsync_interval, self.sync)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def _sync(self):
+        if self.file is not None and self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.pending = 0
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def snapshot(self, orders):
+        """
+        Atomically writes the current orders as a snapshot, then truncates the log.
+        """
+        with self.lock:
+            self._snapshot(orders)
+
+    def _snapshot(self, orders):
+        self._sync()
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"seq": self.seq}) + "\n")
+            for order in orders:
+                file.write(json.dumps(order) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.records_since_snapshot = 0
+
+    def close(self):
+        with self.lock:
+            self._sync()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+class OrderDeque:
+    def __init__(self, max_size, overflow=OVERFLOW_EVICT, spill_path=None, on_evict=None, wal=None):
+        """
+        :param max_size: Maximum number of orders kept in memory.
+        :param overflow: One of OVERFLOW_REJECT, OVERFLOW_BLOCK, OVERFLOW_EVICT or OVERFLOW_SPILL.
+        :param spill_path: Segment file for OVERFLOW_SPILL (a temporary file if not given).
+        :param on_evict: Called with each order dropped by OVERFLOW_EVICT.
+        :param wal: Optional OrderWriteAheadLog; its contents are replayed into the deque first.
+        """
+        if overflow not in (OVERFLOW_REJECT, OVERFLOW_BLOCK, OVERFLOW_EVICT, OVERFLOW_SPILL):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.orders = deque()
+        self.max_size = max_size
+        self.overflow = overflow
+        self.on_evict = on_evict
+        self.evicted_count = 0
+        self.lock = threading.RLock()
+        self.not_full = threading.Condition(self.lock)
+        self.spill = None
+        if overflow == OVERFLOW_SPILL:
+            if spill_path is None:
+                handle, spill_path = tempfile.mkstemp(prefix="orders-", suffix=".spill")
+                os.close(handle)
+            self.spill = OrderSpillFile(spill_path)
+        self.wal = None
+        if wal is not None:
+            self._replay(wal)
+            self.wal = wal
+
+    def _replay(self, wal):
+        operations = {
+            "add_front": lambda order: self._add_front(order, 0),
+            "add_rear": lambda order: self._add_rear(order, 0),
+            "remove_front": lambda order: self._remove_front(),
+            "remove_rear": lambda order: self._remove_rear(),
+        }
+        on_evict, self.on_evict = self.on_evict, None
+        with self.lock:
+            for operation, order in wal.recover():
+                operations[operation](order)
+        self.on_evict = on_evict
+        self.evicted_count = 0
+
+    def _log(self, operation, order=None):
+        # Called with the lock held, after the operation succeeded
+        self.wal.append(operation, order)
+        if self.wal.records_since_snapshot >= self.wal.snapshot_every:
+            self.wal.snapshot(self.display_orders())
+
+    def __len__(self):
+        return len(self.orders) + (len(self.spill) if self.spill else 0)
+
+    def add_order_front(self, order, timeout=None):
+        """
+        Adds an order at the front. Returns False if the order was not added.
+        :param timeout: Longest time to wait for space with OVERFLOW_BLOCK.
+        """
+        with self.lock:
+            added = self._add_front(order, timeout)
+            if added and self.wal:
+                self._log("add_front", order)
+            return added
+
+    def add_order_rear(self, order, timeout=None):
+        """
+        Adds an order at the rear. Returns False if the order was not added.
+        :param timeout: Longest time to wait for space with OVERFLOW_BLOCK.
+        """
+        with self.lock:
+            added = self._add_rear(order, timeout)
+            if added and self.wal:
+                self._log("add_rear", order)
+            return added
+
+    def remove_order_front(self):
+        with self.lock:
+            order = self._remove_front()
+            if order is not None and self.wal:
+                self._log("remove_front")
+            return order
+
+    def remove_order_rear(self):
+        with self.lock:
+            order = self._remove_rear()
+            if order is not None and self.wal:
+                self._log("remove_rear")
+            return order
+
+    def _add_front(self, order, timeout):
+        if len(self.orders) >= self.max_size and not self._make_room(timeout, evict_rear=True):
+            return False
+        self.orders.appendleft(order)
+        if self.spill is not None and len(self.orders) > self.max_size:
+            self.spill.push_front(self.orders.pop())
+        return True
+
+    def _add_rear(self, order, timeout):
+        if self.spill is not None and (self.spill or len(self.orders) >= self.max_size):
+            self.spill.push_rear(order)
+            return True
+        if len(self.orders) >= self.max_size and not self._make_room(timeout, evict_rear=False):
+            return False
+        self.orders.append(order)
+        return True
+
+    def _make_room(self, timeout, evict_rear):
+        if self.overflow == OVERFLOW_SPILL:
+            return True
+        if self.overflow == OVERFLOW_REJECT:
+            return False
+        if self.overflow == OVERFLOW_BLOCK:
+            return self.not_full.wait_for(lambda: len(self.orders) < self.max_size, timeout)
+        evicted = self.orders.pop() if evict_rear else self.orders.popleft()
+        self.evicted_count += 1
+        if self.on_evict:
+            self.on_evict(evicted)
+        return True
+
+    def _remove_front(self):
+        if not self.orders:
+            return None
+        order = self.orders.popleft()
+        if self.spill:
+            self.orders.append(self.spill.pop_front())
+        self.not_full.notify()
+        return order
+
+    def _remove_rear(self):
+        if self.spill:
+            return self.spill.pop_rear()
+        if not self.orders:
+            return None
+        order = self.orders.pop()
+        self.not_full.notify()
+        return order
+
+    def display_orders(self):
+        with self.lock:
+            orders = list(self.orders)
+            if self.spill:
+                orders.extend(self.spill)
+            return orders
+
+    def orders_window(self, start, count):
+        """
+        Returns up to count orders starting at index start, without copying the whole deque.
+        Spilled orders are read straight from their offsets in the segment file.
+        A deque has no random access, so a window in the middle of the in-memory orders
+        still costs O(n): indexing skips a 64-order block per step, about 0.5 ms at 1M orders
+        for a page of 25. Windows near either end cost O(count).
+        """
+        with self.lock:
+            in_memory = len(self.orders)
+            end = min(start + count, len(self))
+            window = []
+            if start < in_memory:
+                if end - start < 64:
+                    # Each index walks whole blocks in from the nearer end, which beats
+                    # stepping through every order before a short window
+                    window.extend(self.orders[index] for index in range(start, min(end, in_memory)))
+                elif start <= in_memory // 2:
+                    window.extend(islice(self.orders, start, min(end, in_memory)))
+                else:
+                    # Closer to the rear, so walk in from that end instead
+                    tail = list(islice(reversed(self.orders), 0, in_memory - start))
+                    window.extend(reversed(tail[in_memory - min(end, in_memory):]))
+            for index in range(max(start, in_memory), end):
+                window.append(self.spill[index - in_memory])
+            return window
+
+    def close(self):
+        """
+        Flushes the write-ahead log and removes the spill file, if any.
+        """
+        if self.wal is not None:
+            self.wal.close()
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+
+# Thread-safe deque that consumers can wait on, from threads or coroutines
+class ConcurrentOrderDeque(OrderDeque):
+    def __init__(self, max_size, overflow=OVERFLOW_REJECT, spill_path=None, on_evict=None, wal=None):
+        super().__init__(max_size, overflow, spill_path, on_evict, wal)
+        self.not_empty = threading.Condition(self.lock)
+        self.async_waiters = deque()  # (event loop, future) pairs of waiting coroutines
+
+    def add_order_front(self, order, timeout=None):
+        with self.lock:
+            added = super().add_order_front(order, timeout)
+            if added:
+                self._wake_consumers(1)
+            return added
+
+    def add_order_rear(self, order, timeout=None):
+        with self.lock:
+            added = super().add_order_rear(order, timeout)
+            if added:
+                self._wake_consumers(1)
+            return added
+
+    def push_many(self, orders, rear=True, timeout=None):
+        """
+        Adds a batch of orders while taking the lock once.
+        :return: Number of orders added (fewer than given if some were rejected).
+        """
+        add = super().add_order_rear if rear else super().add_order_front
+        added = 0
+        with self.lock:
+            for order in orders:
+                if add(order, timeout):
+                    added += 1
+                    # Wake a consumer per order rather than after the batch: with OVERFLOW_BLOCK
+                    # a later add may wait for room that only a woken consumer can make
+                    self._wake_consumers(1)
+        return added
+
+    def _wake_consumers(self, count):
+        # Called with the lock held
+        self.not_empty.notify(count)
+        while count and self.async_waiters:
+            loop, future = self.async_waiters.popleft()
+            loop.call_soon_threadsafe(self._resolve_waiter, future)
+            count -= 1
+
+    @staticmethod
+    def _resolve_waiter(future):
+        if not future.done():
+            future.set_result(None)
+
+    def pop_front(self, timeout=None):
+        """
+        Removes the front order, waiting up to timeout seconds for one to arrive.
+        Returns None on timeout.
+        """
+        with self.lock:
+            if not self.not_empty.wait_for(lambda: len(self) > 0, timeout):
+                return None
+            return self.remove_order_front()
+
+    def pop_rear(self, timeout=None):
+        with self.lock:
+            if not self.not_empty.wait_for(lambda: len(self) > 0, timeout):
+                return None
+            return self.remove_order_rear()
+
+    def pop_many(self, max_items, timeout=None, rear=False):
+        """
+        Waits for at least one order, then removes up to max_items under a single lock.
+        Returns an empty list on timeout.
+        """
+        remove = self.remove_order_rear if rear else self.remove_order_front
+        with self.lock:
+            if not self.not_empty.wait_for(lambda: len(self) > 0, timeout):
+                return []
+            return [remove() for _ in range(min(max_items, len(self)))]
+
+    async def pop_front_async(self, timeout=None):
+        return await self._pop_async(self.remove_order_front, timeout)
+
+    async def pop_rear_async(self, timeout=None):
+        return await self._pop_async(self.remove_order_rear, timeout)
+
+    async def _pop_async(self, remove, timeout):
+        import asyncio  # Imported here so threaded workers don't pay for it at startup
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self.lock:
+                if len(self) > 0:
+                    return remove()
+                future = loop.create_future()
+                waiter = (loop, future)
+                self.async_waiters.append(waiter)
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                self._forget_waiter(waiter)
+                return None
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                self._forget_waiter(waiter)
+                return None
+            except asyncio.CancelledError:
+                self._forget_waiter(waiter)
+                raise
+
+    def _forget_waiter(self, waiter):
+        with self.lock:
+            if waiter in self.async_waiters:
+                self.async_waiters.remove(waiter)
+            elif len(self) > 0:
+                # We were woken just as we gave up, so pass the wake-up on
+                self._wake_consumers(1)
+
+# One deque per technician; idle technicians steal from the rear of the busiest deque
+class WorkStealingDispatcher:
+    def __init__(self, technicians, handle_order, max_size=100000, steal=True):
+        """
+        :param technicians: Number of technicians (worker threads), one deque each.
+        :param handle_order: Function called with each order to service it.
+        :param steal: Set to False to keep each technician on their own deque.
+        """
+        self.queues = [OrderDeque(max_size, overflow=OVERFLOW_REJECT) for _ in range(technicians)]
+        self.handle_order = handle_order
+        self.steal = steal
+        # Guards choosing a deque to add to or steal from, and the idle count below;
+        # technicians popping from their own deque don't need it
+        self.lock = threading.Lock()
+        self.work_available = threading.Condition(self.lock)
+        self.idle = 0  # Technicians of the current run waiting for work (or done)
+
+    def submit(self, order, technician=None):
+        """
+        Queues an order for a technician, or for the least busy one if none is given.
+        Can be called while run() is active, also from handle_order; the order is then
+        serviced before run() returns.
+        Returns False if that technician's deque is full.
+        """
+        with self.lock:
+            if technician is None:
+                technician = min(range(len(self.queues)), key=lambda i: len(self.queues[i]))
+            added = self.queues[technician].add_order_rear(order)
+            if added:
+                self.work_available.notify_all()
+            return added
+
+    def _next_order(self, own_queue, stats):
+        order = own_queue.remove_order_front()
+        if order is not None:
+            return order
+        with self.lock:
+            self.idle += 1
+            while True:
+                order = own_queue.remove_order_front()
+                while order is None and self.steal:
+                    victim = max((queue for queue in self.queues if queue is not own_queue), key=len, default=None)
+                    if victim is None or len(victim) == 0:
+                        break
+                    # The victim's owner pops without the lock and may empty it first; then look again
+                    order = victim.remove_order_rear()
+                    if order is not None:
+                        stats["steals"] += 1
+                if order is not None:
+                    self.idle -= 1
+                    return order
+                if self.idle == len(self.queues):
+                    # Everyone is waiting, so nobody is servicing an order that could submit more
+                    self.work_available.notify_all()
+                    return None
+                self.work_available.wait()
+
+    def _work(self, technician):
+        own_queue = self.queues[technician]
+        stats = {"technician": technician, "processed": 0, "steals": 0, "busy_seconds": 0.0}
+        try:
+            while True:
+                order = self._next_order(own_queue, stats)
+                if order is None:
+                    return stats
+                start = time.perf_counter()
+                self.handle_order(order)
+                stats["busy_seconds"] += time.perf_counter() - start
+                stats["processed"] += 1
+        except BaseException:
+            # Count this technician as idle for good, so the others don't wait for it forever
+            with self.lock:
+                self.idle += 1
+                self.work_available.notify_all()
+            raise
+
+    def run(self):
+        """
+        Services every queued order on a thread pool and returns per-technician stats
+        (processed, steals, busy_seconds, utilization) plus the total elapsed time.
+        Returns once every deque is empty and no technician is servicing an order;
+        orders submitted after that wait for the next run.
+        """
+        with self.lock:
+            self.idle = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(self.queues)) as pool:
+            # Not pool.map: when one technician fails it cancels the ones not started yet,
+            # and the others would then wait for them forever
+            futures = [pool.submit(self._work, technician) for technician in range(len(self.queues))]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+        for stats in results:
+            stats["utilization"] = stats["busy_seconds"] / elapsed if elapsed else 0.0
+        return {"elapsed_seconds": elapsed, "technicians": results}
@@ -0,0 +1,177 @@
+# Singly Linked List Node
+class Node:
+    __slots__ = ("order_id", "customer_name", "service_type", "next", "prev", "formatted")
+
+    def __init__(self, order_id, customer_name, service_type):
+        self.order_id = order_id
+        self.customer_name = customer_name
+        self.service_type = service_type
+        self.next = None
+        self.prev = None  # Back link so an indexed node can be unlinked in O(1)
+        self.formatted = None  # Cached display line, cleared whenever the order changes
+
+    def format(self):
+        if self.formatted is None:
+            self.formatted = f"Order ID: {self.order_id}, Customer: {self.customer_name}, Service: {self.service_type}"
+        return self.formatted
+
+    def update(self, customer_name=None, service_type=None):
+        if customer_name is not None:
+            self.customer_name = customer_name
+        if service_type is not None:
+            self.service_type = service_type
+        self.formatted = None
+
+# Singly Linked List for managing orders
+class SinglyLinkedList:
+    def __init__(self):
+        self.head = None
+        self.tail = None
+        # Last order removed while it was the tail, until an append gives it a next node
+        self._removed_tail = None
+        # order_id -> nodes with that id, in list order (None until first used after load_orders)
+        self._index = {}
+
+    @property
+    def index(self):
+        if self._index is None:
+            index = self._index = {}
+            current = self.head
+            while current:
+                index.setdefault(current.order_id, []).append(current)
+                current = current.next
+        return self._index
+
+    def load_orders(self, records):
+        """
+        Appends (order_id, customer_name, service_type) records in one pass, e.g. when
+        restoring a snapshot. The id index is rebuilt on the first lookup rather than here,
+        so a restored list can be shown before it has been indexed.
+        """
+        previous = self.tail
+        for order_id, customer_name, service_type in records:
+            node = Node(order_id, customer_name, service_type)
+            if self._removed_tail is not None:
+                self._removed_tail.next = node
+                self._removed_tail = None
+            if previous is None:
+                self.head = node
+            else:
+                previous.next = node
+                node.prev = previous
+            previous = node
+        if previous is not self.tail:
+            self.tail = previous
+            self._index = None
+
+    def add_order(self, order_id, customer_name, service_type):
+        # Fetched before linking: a lazy rebuild afterwards would already contain the new node
+        index = self.index
+        new_node = Node(order_id, customer_name, service_type)
+        if self._removed_tail is not None:
+            self._removed_tail.next = new_node
+            self._removed_tail = None
+        if not self.head:
+            self.head = new_node
+        else:
+            self.tail.next = new_node
+            new_node.prev = self.tail
+        self.tail = new_node
+        index.setdefault(order_id, []).append(new_node)
+
+    def has_order(self, order_id):
+        return order_id in self.index
+
+    def find_order(self, order_id):
+        """
+        Returns the first node with this order id, or None.
+        """
+        nodes = self.index.get(order_id)
+        return nodes[0] if nodes else None
+
+    def remove_order(self, order_id):
+        nodes = self.index.get(order_id)
+        if not nodes:
+            return False
+        node = nodes.pop(0)
+        if not nodes:
+            del self.index[order_id]
+        self._unlink(node)
+        return True
+
+    def remove_many(self, order_ids):
+        """
+        Removes one order per id in order_ids in a single pass over the ids.
+        :return: Number of orders removed.
+        """
+        removed = 0
+        for order_id in order_ids:
+            if self.remove_order(order_id):
+                removed += 1
+        return removed
+
+    def _unlink(self, node):
+        # node.next is left alone, so a cursor on a removed node can still follow it forward
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+            # Nothing follows it yet: point it at the earlier removed tail, whose next the
+            # following append fills in, or keep it as that removed tail itself
+            if self._removed_tail is not None:
+                node.next = self._removed_tail
+            else:
+                self._removed_tail = node
+        node.prev = None
+
+    def update_order(self, order_id, customer_name=None, service_type=None):
+        node = self.find_order(order_id)
+        if node is None:
+            return False
+        node.update(customer_name, service_type)
+        return True
+
+    def iter_orders(self, start_after=None, limit=None, start_after_node=None):
+        """
+        Lazily yields formatted order lines, reusing each node's cached line.
+        :param start_after: Order id to resume after; starts from the head if None or no longer present.
+                            With duplicate ids this is the first order with the id.
+        :param limit: Maximum number of lines to yield.
+        :param start_after_node: Node to resume after instead, e.g. the last one on a page.
+                                 Unambiguous even with duplicate ids, and still works once it is removed.
+        """
+        for node in self.iter_order_nodes(start_after, limit, start_after_node):
+            yield node.format()
+
+    def iter_order_nodes(self, start_after=None, limit=None, start_after_node=None):
+        current = self.head
+        if start_after_node is not None:
+            current = self._node_after(start_after_node)
+        elif start_after is not None:
+            node = self.find_order(start_after)
+            if node is not None:
+                current = node.next
+        count = 0
+        while current and (limit is None or count < limit):
+            yield current
+            count += 1
+            current = current.next
+
+    def _node_after(self, node):
+        # A removed node still links to what followed it, and that to what followed
+        # it in turn, so the first node still linked is the first order after the cursor
+        current = node.next
+        while current is not None and current.prev is None and current is not self.head:
+            current = current.next
+        # Shortcut the removed nodes walked over, so later cursors on them don't walk it again.
+        # Not when the walk ran off the end: the last of them is still waiting for an append.
+        while current is not None and node is not current and node.prev is None and node is not self.head:
+            node.next, node = current, node.next
+        return current
+
+    def display_orders(self):
+        return list(self.iter_orders())
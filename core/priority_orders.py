@@ -0,0 +1,258 @@
+import bisect
+import operator
+
+# Singly Linked List Node
+class Node:
+    def __init__(self, order_id, customer_name, service_type, priority):
+        self.order_id = order_id
+        self.customer_name = customer_name
+        self.service_type = service_type
+        self.priority = priority  # Priority value to sort by
+        self.next = None
+
+# Singly Linked List for managing orders
+class SinglyLinkedList:
+    def __init__(self):
+        self.head = None
+        self.tail = None  # Kept so appends don't have to walk the list
+
+    def add_order(self, order_id, customer_name, service_type, priority):
+        new_node = Node(order_id, customer_name, service_type, priority)
+        if not self.head:
+            self.head = new_node
+        else:
+            self.tail.next = new_node
+        self.tail = new_node
+
+    def insertion_sort(self):
+        """
+        Sorts the linked list based on priority using Insertion Sort.
+        """
+        if self.head is None:
+            return
+        
+        sorted_list = None  # Start with an empty sorted list
+        current = self.head
+        
+        # Traverse the original list and insert each node in the sorted list
+        while current:
+            next_node = current.next
+            sorted_list = self.sorted_insert(sorted_list, current)
+            current = next_node
+        
+        self.head = sorted_list
+        self.tail = sorted_list
+        while self.tail.next:
+            self.tail = self.tail.next
+
+    def sorted_insert(self, sorted_list, new_node):
+        """
+        Helper function to insert a new node into the sorted linked list.
+        """
+        if sorted_list is None or new_node.priority < sorted_list.priority:
+            new_node.next = sorted_list
+            sorted_list = new_node
+        else:
+            current = sorted_list
+            while current.next and current.next.priority < new_node.priority:
+                current = current.next
+            new_node.next = current.next
+            current.next = new_node
+        return sorted_list
+
+    def merge_sort(self, key=None, reverse=False):
+        """
+        Stable, in-place natural merge sort in O(n log n), or close to O(n) on nearly sorted lists.
+        :param key: Function of a node, e.g. lambda node: (node.priority, node.customer_name). Defaults to priority.
+        :param reverse: Sort in descending order, keeping equal keys in their current order.
+        """
+        self.head, self.tail = merge_sort_nodes(self.head, key, reverse)
+
+    def iter_orders(self):
+        """
+        Lazily yields formatted order lines from the head.
+        """
+        current = self.head
+        while current:
+            yield f"Order ID: {current.order_id}, Customer: {current.customer_name}, Service: {current.service_type}, Priority: {current.priority}"
+            current = current.next
+
+    def display_orders(self):
+        return list(self.iter_orders())
+
+def merge_sort_nodes(head, key=None, reverse=False):
+    """
+    Bottom-up natural merge sort of a chain of nodes linked through .next.
+    Strictly descending runs are reversed first, then neighbouring ascending runs
+    are merged pairwise while walking the chain, pass after pass, so sorted input
+    costs one pass. Only the links are changed, with a single sentinel node.
+    :return: (new head, new tail)
+    """
+    if head is None:
+        return None, None
+    key = key or operator.attrgetter("priority")
+    # before(first, second) is True if first must come before second (strictly);
+    # first > second falls back to second < first, so keys only need __lt__, as for sorted()
+    before = operator.gt if reverse else operator.lt
+
+    sentinel = Node(None, None, None, None)
+
+    # Reverse strictly descending runs (which have no ties to keep in order) and count the runs
+    tail = sentinel
+    runs = 0
+    node = head
+    while node:
+        runs += 1
+        previous_key = key(node)
+        following = node.next
+        if following is not None and before(key(following), previous_key):
+            run_tail = node
+            reversed_head = None
+            while True:
+                next_node = node.next
+                node.next = reversed_head
+                reversed_head = node
+                node = next_node
+                if node is None:
+                    break
+                node_key = key(node)
+                if not before(node_key, previous_key):
+                    break
+                previous_key = node_key
+            tail.next = reversed_head
+            tail = run_tail
+            continue
+        tail.next = node
+        while following is not None:
+            following_key = key(following)
+            if before(following_key, previous_key):
+                break
+            previous_key = following_key
+            node = following
+            following = node.next
+        tail = node
+        node = following
+    tail.next = None
+
+    # Each pass merges the runs two by two; taking from the left run on ties keeps it stable
+    while runs > 1:
+        runs = 0
+        tail = sentinel
+        left = sentinel.next
+        while left is not None:
+            runs += 1
+            # The left run ends at the first descent; the right run starts there
+            left_end = left
+            previous_key = key(left)
+            right = left.next
+            while right is not None:
+                right_key = key(right)
+                if before(right_key, previous_key):
+                    break
+                previous_key = right_key
+                left_end = right
+                right = right.next
+            if right is None:
+                tail.next = left
+                tail = left_end
+                break
+            left_end.next = None
+            left_key = key(left)
+            rest = None  # First node after the right run, found while merging it
+            while True:
+                if before(right_key, left_key):
+                    tail.next = tail = right
+                    following = right.next
+                    if following is not None:
+                        following_key = key(following)
+                        if not before(following_key, right_key):
+                            right, right_key = following, following_key
+                            continue
+                        rest = following
+                    right = None
+                    break
+                tail.next = tail = left
+                left = left.next
+                if left is None:
+                    break
+                left_key = key(left)
+            if right is None:
+                tail.next = left
+                tail = left_end
+            else:
+                # Left run used up: the rest of the right run is already linked in order
+                tail.next = right
+                tail = right
+                following = right.next
+                while following is not None:
+                    following_key = key(following)
+                    if before(following_key, right_key):
+                        rest = following
+                        break
+                    right_key = following_key
+                    tail = following
+                    following = following.next
+            left = rest
+        tail.next = None
+    return sentinel.next, tail
+
+# Linked list that stays in priority order as orders are added
+class BucketedOrderList(SinglyLinkedList):
+    """
+    Keeps a head/tail pointer per priority bucket, all chained into one list.
+    Appends are O(1) for a fixed set of priorities (O(log p) for a new priority),
+    orders stay sorted by priority with FIFO order inside each priority,
+    so insertion_sort has nothing left to do.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.priorities = []      # Sorted priorities that have at least one order
+        self.bucket_heads = {}
+        self.bucket_tails = {}
+
+    def add_order(self, order_id, customer_name, service_type, priority):
+        new_node = Node(order_id, customer_name, service_type, priority)
+        bucket_tail = self.bucket_tails.get(priority)
+        if bucket_tail is not None:
+            new_node.next = bucket_tail.next
+            bucket_tail.next = new_node
+        else:
+            position = bisect.bisect_left(self.priorities, priority)
+            if position == 0:
+                new_node.next = self.head
+                self.head = new_node
+            else:
+                previous_tail = self.bucket_tails[self.priorities[position - 1]]
+                new_node.next = previous_tail.next
+                previous_tail.next = new_node
+            self.priorities.insert(position, priority)
+            self.bucket_heads[priority] = new_node
+        self.bucket_tails[priority] = new_node
+        if new_node.next is None:
+            self.tail = new_node
+
+    def insertion_sort(self):
+        """
+        The list is always sorted, so this is a no-op kept for API compatibility.
+        """
+
+    def merge_sort(self, key=None, reverse=False):
+        """
+        Orders stay grouped by priority, so this sorts each priority bucket by key
+        (e.g. customer name), which gives (priority, key) ordering overall.
+        """
+        previous_tail = None
+        for priority in self.priorities:
+            following = self.bucket_tails[priority].next
+            self.bucket_tails[priority].next = None
+            bucket_head, bucket_tail = merge_sort_nodes(self.bucket_heads[priority], key, reverse)
+            if previous_tail is None:
+                self.head = bucket_head
+            else:
+                previous_tail.next = bucket_head
+            bucket_tail.next = following
+            self.bucket_heads[priority] = bucket_head
+            self.bucket_tails[priority] = bucket_tail
+            previous_tail = bucket_tail
+        self.tail = previous_tail
@@ -0,0 +1,481 @@
+import bisect
+import csv
+import json
+import os
+import sys
+from collections import deque
+
+class TreeNode:
+    def __init__(self, name, attributes=None):
+        """
+        Initializes a tree node.
+        :param name: Name of the node (e.g., category or service name).
+        :param attributes: Optional numeric attributes, e.g. {"price": 49.0, "labour_minutes": 30}.
+        """
+        self.name = name
+        self.children = []
+        self.parent = None
+        self.indexes = ()  # IndexedServiceTrees this node belongs to, kept current by add_child
+        self.attributes = dict(attributes or {})
+        # Rollups over this node's subtree, kept up to date by add_child/set_attribute
+        self.subtree_size = 1
+        self.aggregates = {key: [1, value, value, value] for key, value in self.attributes.items()}  # [count, sum, min, max]
+
+    def add_child(self, child_node):
+        """
+        Adds a child node to this node.
+        :param child_node: TreeNode to be added as a child.
+        """
+        self.children.append(child_node)
+        child_node.parent = self
+        # Fold the child's rollups into every ancestor
+        node = self
+        while node is not None:
+            node.subtree_size += child_node.subtree_size
+            for key, (count, total, minimum, maximum) in child_node.aggregates.items():
+                aggregate = node.aggregates.get(key)
+                if aggregate is None:
+                    node.aggregates[key] = [count, total, minimum, maximum]
+                else:
+                    aggregate[0] += count
+                    aggregate[1] += total
+                    aggregate[2] = min(aggregate[2], minimum)
+                    aggregate[3] = max(aggregate[3], maximum)
+            node = node.parent
+        for index in self.indexes:
+            index.attach(child_node)
+
+    def set_attribute(self, key, value):
+        """
+        Sets a numeric attribute and updates the rollups on the path to the root.
+        """
+        self.attributes[key] = value
+        node = self
+        while node is not None:
+            node._recompute_aggregate(key)
+            node = node.parent
+
+    def _recompute_aggregate(self, key):
+        # Rebuilds one rollup from this node's own value and its children's rollups
+        parts = [child.aggregates[key] for child in self.children if key in child.aggregates]
+        if key in self.attributes:
+            value = self.attributes[key]
+            parts.append([1, value, value, value])
+        if parts:
+            self.aggregates[key] = [sum(part[0] for part in parts), sum(part[1] for part in parts),
+                                    min(part[2] for part in parts), max(part[3] for part in parts)]
+        else:
+            self.aggregates.pop(key, None)
+
+    def path(self):
+        """
+        Returns the names from the root down to this node.
+        """
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return names[::-1]
+
+    def rollup(self, key):
+        """
+        Returns count/sum/min/max/average of an attribute over this subtree in O(1),
+        or None if no service in the subtree has it.
+        """
+        aggregate = self.aggregates.get(key)
+        if aggregate is None:
+            return None
+        count, total, minimum, maximum = aggregate
+        return {"count": count, "sum": total, "min": minimum, "max": maximum, "average": total / count}
+
+    def display_tree(self, level=0, stream=None):
+        """
+        Prints the tree structure, writing lines to the stream in large chunks.
+        :param level: Depth of this node, for indentation.
+        :param stream: File-like object to write to (defaults to sys.stdout).
+        """
+        stream = stream or sys.stdout
+        lines = []
+        for node, depth in self.iter_preorder(level):
+            lines.append(" " * depth * 4 + f"- {node.name}\n")
+            if len(lines) >= 4096:
+                stream.write("".join(lines))
+                lines = []
+        stream.write("".join(lines))
+
+    def iter_preorder(self, level=0):
+        """
+        Yields (node, depth) pairs in pre-order using an explicit stack.
+        """
+        stack = [(self, level)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            for child in reversed(node.children):
+                stack.append((child, depth + 1))
+
+    def iter_bfs(self, level=0):
+        """
+        Yields (node, depth) pairs level by level.
+        """
+        queue = deque([(self, level)])
+        while queue:
+            node, depth = queue.popleft()
+            yield node, depth
+            for child in node.children:
+                queue.append((child, depth + 1))
+
+
+class ServiceSearchIndex:
+    """
+    Case-insensitive index over service names for prefix autocomplete and bounded
+    edit-distance (fuzzy) matching. Results carry the full path.
+
+    Names are kept as one sorted list searched with bisect, instead of a trie with a
+    dict per character. Fuzzy matching walks that list as an implicit trie: rows of the
+    edit-distance table are shared with the previous name for their common prefix, and
+    a hopeless prefix skips every name that starts with it.
+    """
+
+    def __init__(self):
+        self.entries = []  # (lower-cased name, TreeNode), sorted by name once self.keys is rebuilt
+        self.keys = []     # Lower-cased names of self.entries, for bisect
+        self.dirty = False
+
+    def add(self, node):
+        # Sorted lazily, so indexing a whole tree is one sort rather than n insertions
+        self.entries.append((node.name.lower(), node))
+        self.dirty = True
+
+    def _sorted_keys(self):
+        if self.dirty:
+            self.entries.sort(key=lambda entry: entry[0])  # Stable, so equal names keep insertion order
+            self.keys = [key for key, node in self.entries]
+            self.dirty = False
+        return self.keys
+
+    def complete(self, prefix, limit=10):
+        """
+        Returns up to limit (name, path) pairs whose name starts with prefix, alphabetically.
+        """
+        keys = self._sorted_keys()
+        prefix = prefix.lower()
+        results = []
+        index = bisect.bisect_left(keys, prefix)
+        while index < len(keys) and len(results) < limit and keys[index].startswith(prefix):
+            node = self.entries[index][1]
+            results.append((node.name, node.path()))
+            index += 1
+        return results
+
+    def fuzzy(self, query, max_distance=1, limit=10, prefixes=False):
+        """
+        Returns up to limit (name, distance, path) tuples for names within
+        max_distance edits of query, closest first.
+        :param prefixes: Match names that start with something within max_distance edits of
+                         query, so a typo in a partly typed name still finds it.
+        """
+        keys = self._sorted_keys()
+        query = query.lower()
+        width = len(query) + 1
+        # rows[k] is the edit-distance row for the first k characters of the current name;
+        # best[k] is the closest any of those prefixes gets to the whole query
+        rows = [list(range(width))]
+        best = [rows[0][-1]]
+        found = [[] for _ in range(max_distance + 1)]  # Matches per distance, in name order
+        wanted = max_distance  # Lowered once closer matches already fill the limit
+        previous = ""
+        index = 0
+        while index < len(keys) and wanted >= 0:
+            key = keys[index]
+            common = 0
+            for a, b in zip(key, previous):
+                if a != b or common == len(rows) - 1:
+                    break
+                common += 1
+            del rows[common + 1:], best[common + 1:]
+            previous = key
+            while len(rows) <= len(key):
+                row = rows[-1]
+                char = key[len(rows) - 1]
+                new_row = [row[0] + 1]
+                for column in range(1, width):
+                    cost = 0 if query[column - 1] == char else 1
+                    new_row.append(min(new_row[column - 1] + 1, row[column] + 1, row[column - 1] + cost))
+                rows.append(new_row)
+                best.append(min(best[-1], new_row[-1]))
+                # No longer name can get back under the limit once the whole row is over it
+                if min(new_row) > wanted:
+                    break
+            prefix = key[:len(rows) - 1]
+            end = index + 1
+            if len(rows) <= len(key):
+                # Pruned: every name starting with this prefix ends up the same way
+                end = bisect.bisect_left(keys, prefix + "\U0010ffff", index)
+            distance = best[-1] if prefixes else (rows[-1][-1] if len(rows) > len(key) else wanted + 1)
+            if distance <= wanted:
+                bucket = found[distance]
+                stop = min(end if prefixes else index + 1, index + limit - len(bucket))
+                bucket.extend(node for name, node in self.entries[index:stop])
+                if len(bucket) >= limit:
+                    wanted = distance - 1
+            index = end
+        matches = [(distance, node) for distance, bucket in enumerate(found) for node in bucket][:limit]
+        return [(node.name, distance, node.path()) for distance, node in matches]
+
+
+class IndexedServiceTree:
+    """
+    Precomputed indexes over a TreeNode hierarchy: name lookup, parent pointers,
+    Euler-tour entry/exit numbers for O(1) ancestor tests and binary-lifting
+    tables for lowest-common-ancestor queries.
+    Service names are assumed to be unique; the first node with a name wins.
+    The root may be any node of a larger tree: depths and ancestors are relative
+    to it, and the nodes' parent links are left alone.
+    """
+
+    # Spacing between Euler numbers, so new subtrees usually fit without renumbering
+    GAP = 1 << 16
+    # Smallest spacing a subtree is renumbered with in place before trying its parent
+    MIN_STEP = 4
+
+    def __init__(self, root, searchable=False):
+        """
+        :param searchable: Also keep a ServiceSearchIndex of all names in self.search.
+        """
+        self.root = root
+        self.search = ServiceSearchIndex() if searchable else None
+        self.nodes = {}
+        self.depth = {}
+        self.up = {}  # node -> [parent, grandparent, 4th ancestor, ...]
+        self.entry = {}
+        self.exit = {}
+        self._index_subtree(root)
+        self._renumber()
+
+    def _index_subtree(self, top):
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            if self not in node.indexes:
+                node.indexes += (self,)
+            self.nodes.setdefault(node.name, node)
+            if self.search is not None:
+                self.search.add(node)
+            # Whatever lies above the indexed root is outside the index
+            parent = None if node is self.root else node.parent
+            self.depth[node] = 0 if parent is None else self.depth[parent] + 1
+            up = []
+            ancestor = parent
+            while ancestor is not None:
+                up.append(ancestor)
+                ancestor = self.up[ancestor][len(up) - 1] if len(self.up[ancestor]) >= len(up) else None
+            self.up[node] = up
+            stack.extend(node.children)
+
+    def _number_subtree(self, top, first, step):
+        """
+        Assigns entry/exit numbers first, first + step, ... to top's subtree in DFS order.
+        Returns the next unused number.
+        """
+        counter = first
+        stack = [(top, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                self.exit[node] = counter
+                counter += step
+                continue
+            self.entry[node] = counter
+            counter += step
+            stack.append((node, True))
+            for child in reversed(node.children):
+                stack.append((child, False))
+        return counter
+
+    def _renumber(self):
+        self._number_subtree(self.root, 0, self.GAP)
+
+    def attach(self, child):
+        """
+        Indexes a subtree that was just added under an indexed node (called by add_child).
+        """
+        self._index_subtree(child)
+        parent = child.parent
+        siblings = parent.children
+        low = self.exit[siblings[-2]] if len(siblings) > 1 else self.entry[parent]
+        numbers_needed = 2 * child.subtree_size
+        if self._on_right_edge(parent):
+            # Nothing is numbered after the parent, so it and its ancestors can simply end later
+            end = self._number_subtree(child, low + self.GAP, self.GAP)
+            node = parent
+            while node is not None:
+                self.exit[node] = max(self.exit[node], end)
+                end = self.exit[node] + self.GAP
+                node = None if node is self.root else node.parent
+            return
+        # Take a share of the free gap proportional to the child's share of the parent's
+        # subtree, so a category can keep growing for a while before it is respaced
+        step = min(self.GAP, (self.exit[parent] - low) // (numbers_needed + 2 * parent.subtree_size))
+        if step >= 1:
+            self._number_subtree(child, low + step, step)
+            return
+        # Out of room: respace the nearest ancestor whose range is still sparse, packing its
+        # subtree into the first half of the range and leaving the rest free for appends
+        node = parent
+        while node is not self.root:
+            step = (self.exit[node] - self.entry[node]) // (4 * node.subtree_size)
+            if step >= self.MIN_STEP:
+                exit_number = self.exit[node]
+                self._number_subtree(node, self.entry[node], step)
+                self.exit[node] = exit_number
+                return
+            node = node.parent
+        self._renumber()
+
+    def _on_right_edge(self, node):
+        # True if node and each of its ancestors up to the root is its parent's last child
+        while node is not self.root:
+            if node.parent.children[-1] is not node:
+                return False
+            node = node.parent
+        return True
+
+    def find(self, name):
+        return self.nodes.get(name)
+
+    def path(self, name):
+        """
+        Returns the names from the root down to the named service.
+        """
+        return self.nodes[name].path()
+
+    def is_ancestor(self, ancestor, node):
+        """
+        True if ancestor is node itself or one of its ancestors (TreeNodes).
+        """
+        return self.entry[ancestor] <= self.entry[node] and self.exit[node] <= self.exit[ancestor]
+
+    def is_under(self, service_name, category_name):
+        """
+        True if the named service falls under the named category (or is the category).
+        """
+        return self.is_ancestor(self.nodes[category_name], self.nodes[service_name])
+
+    def lowest_common_ancestor(self, first, second):
+        """
+        Returns the deepest TreeNode that has both nodes in its subtree, in O(log n).
+        """
+        if self.is_ancestor(first, second):
+            return first
+        if self.is_ancestor(second, first):
+            return second
+        node = first
+        for level in range(len(self.up[node]) - 1, -1, -1):
+            up = self.up[node]
+            if level < len(up) and not self.is_ancestor(up[level], second):
+                node = up[level]
+        return node.parent
+
+# Example Hierarchical Tree
+def create_service_tree():
+    """
+    Creates a sample tree structure for the subscription-based car maintenance service.
+    """
+    # Root
+    root = TreeNode("Car Maintenance Services")
+
+    # Level 1
+    oil_services = TreeNode("Oil Services")
+    tire_services = TreeNode("Tire Services")
+    engine_services = TreeNode("Engine Services")
+
+    # Add Level 1 to root
+    root.add_child(oil_services)
+    root.add_child(tire_services)
+    root.add_child(engine_services)
+
+    # Level 2 for Oil Services
+    oil_change = TreeNode("Oil Change")
+    oil_filter_replacement = TreeNode("Oil Filter Replacement")
+    oil_services.add_child(oil_change)
+    oil_services.add_child(oil_filter_replacement)
+
+    # Level 2 for Tire Services
+    tire_rotation = TreeNode("Tire Rotation")
+    tire_replacement = TreeNode("Tire Replacement")
+    tire_services.add_child(tire_rotation)
+    tire_services.add_child(tire_replacement)
+
+    # Level 2 for Engine Services
+    engine_diagnosis = TreeNode("Engine Diagnosis")
+    spark_plug_replacement = TreeNode("Spark Plug Replacement")
+    engine_services.add_child(engine_diagnosis)
+    engine_services.add_child(spark_plug_replacement)
+
+    return root
+
+
+def load_service_tree(path):
+    """
+    Builds a service tree in one pass from a flat adjacency file: a CSV with
+    parent,name columns or JSONL records with "parent" and "name" keys.
+    Extra columns/keys (e.g. price) become numeric attributes of the service.
+    The root is the row with an empty parent; rows may appear in any order.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    nodes = {}
+    root = None
+    with open(path, newline="", encoding="utf-8") as file:
+        if extension in (".jsonl", ".json"):
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            name = row['name']
+            # Any other non-empty column is a numeric attribute of the service
+            attributes = {key: float(value) for key, value in row.items()
+                          if key not in ("parent", "name") and value not in ("", None)}
+            node = nodes.get(name)
+            if node is None:
+                node = nodes[name] = TreeNode(name)
+            node.attributes.update(attributes)
+            parent_name = row.get('parent')
+            if parent_name:
+                parent = nodes.get(parent_name)
+                if parent is None:
+                    # Parent row hasn't been seen yet; create it now and fill it in later
+                    parent = nodes[parent_name] = TreeNode(parent_name)
+                # Linked directly: add_child would update rollups up the whole depth per row
+                parent.children.append(node)
+                node.parent = parent
+            else:
+                root = node
+    if root is None:
+        raise ValueError(f"{path} has no root row (a row with an empty parent)")
+    _rebuild_rollups(root)
+    return root
+
+
+def _rebuild_rollups(root):
+    """
+    Recomputes subtree_size and aggregates for every node under root in one post-order pass.
+    """
+    nodes = [node for node, depth in root.iter_preorder()]
+    for node in reversed(nodes):
+        size = 1
+        aggregates = {key: [1, value, value, value] for key, value in node.attributes.items()}
+        for child in node.children:
+            size += child.subtree_size
+            for key, (count, total, minimum, maximum) in child.aggregates.items():
+                aggregate = aggregates.get(key)
+                if aggregate is None:
+                    aggregates[key] = [count, total, minimum, maximum]
+                else:
+                    aggregate[0] += count
+                    aggregate[1] += total
+                    aggregate[2] = min(aggregate[2], minimum)
+                    aggregate[3] = max(aggregate[3], maximum)
+        node.subtree_size = size
+        node.aggregates = aggregates
@@ -0,0 +1,343 @@
+import contextlib
+import gc
+import hashlib
+import itertools
+import json
+import mmap
+import os
+import struct
+import zlib
+
+from core import order_deque, order_list, priority_orders, task_tree
+
+# Chunk file layout: header, one descriptor per column, then the column payloads.
+# Integer columns are raw int64 arrays (8-byte aligned, read through a memoryview);
+# string columns are UTF-8 values joined with NUL bytes.
+CHUNK_MAGIC = b"CMSCHNK1"
+CHUNK_HEADER = struct.Struct("<8sII")   # magic, record count, column count
+COLUMN_HEADER = struct.Struct("<cQ")    # kind (b"i" or b"s"), payload length
+
+# Average records per chunk file; a checkpoint only rewrites chunks whose bytes changed.
+# Chunks end after a record whose boundary hash is a multiple of this, so an insert or
+# delete only changes the chunk it falls in instead of shifting every later chunk.
+CHUNK_SIZE = 16384
+
+
+def encode_chunk(kinds, records):
+    """
+    Serializes a list of equal-length tuples column by column.
+    :param kinds: One character per field, "i" for int and "s" for str.
+    """
+    columns = list(zip(*records)) if records else [() for _ in kinds]
+    payloads = []
+    for kind, column in zip(kinds, columns):
+        if kind == "i":
+            payloads.append(struct.pack(f"<{len(column)}q", *column))
+        else:
+            joined = "\0".join(column)
+            # Counted on the joined string, which is much cheaper than checking value by value
+            if joined.count("\0") != max(0, len(column) - 1):
+                raise ValueError("Strings stored in a snapshot can't contain NUL characters")
+            payloads.append(joined.encode("utf-8"))
+    parts = [CHUNK_HEADER.pack(CHUNK_MAGIC, len(records), len(kinds))]
+    parts += [COLUMN_HEADER.pack(kind.encode(), len(payload)) for kind, payload in zip(kinds, payloads)]
+    offset = sum(len(part) for part in parts)
+    for payload in payloads:
+        padding = -offset % 8
+        parts.append(b"\0" * padding + payload)
+        offset += padding + len(payload)
+    return b"".join(parts)
+
+
+def decode_columns(path):
+    """
+    Reads a chunk file through mmap and returns its columns as lists.
+    Integer columns are reinterpreted with memoryview.cast rather than unpacked value by
+    value, but both kinds are still copied out into Python ints and strs.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, count, column_count = CHUNK_HEADER.unpack_from(data, 0)
+            if magic != CHUNK_MAGIC:
+                raise ValueError(f"{path} is not a snapshot chunk")
+            offset = CHUNK_HEADER.size
+            descriptors = []
+            for _ in range(column_count):
+                descriptors.append(COLUMN_HEADER.unpack_from(data, offset))
+                offset += COLUMN_HEADER.size
+            columns = []
+            view = memoryview(data)
+            try:
+                for kind, length in descriptors:
+                    offset += -offset % 8
+                    payload = view[offset:offset + length]
+                    if kind == b"i":
+                        ints = payload.cast("q")
+                        columns.append(ints.tolist())
+                        ints.release()
+                    else:
+                        columns.append(str(payload, "utf-8").split("\0") if count else [])
+                    payload.release()
+                    offset += length
+            finally:
+                view.release()
+    return columns
+
+
+def decode_chunk(path):
+    """
+    Returns the records of a chunk file as a list of tuples.
+    """
+    columns = decode_columns(path)
+    return list(zip(*columns)) if columns else []
+
+
+class TaskTreeAdapter:
+    kinds = "sis"
+
+    @staticmethod
+    def boundary_hash(record):
+        # Tasks have no id, so every field goes into the hash
+        return zlib.crc32(record[2].encode("utf-8"), zlib.crc32(record[0].encode("utf-8"), record[1] & 0xFFFFFFFF))
+
+    @staticmethod
+    def records(tree):
+        return ((task['type'], task['priority'], task['customer']) for task in tree.iter_tasks())
+
+    @staticmethod
+    def options(tree):
+        return {"class": type(tree).__name__}
+
+    @staticmethod
+    def restore(records, options):
+        tree = getattr(task_tree, options["class"])()
+        # Records are already in priority order, so the tree is rebuilt bottom-up in O(n)
+        nodes = [tree._new_node({"type": task_type, "priority": priority, "customer": customer})
+                 for task_type, priority, customer in records]
+        tree.root = tree._build_balanced(nodes)
+        return tree
+
+
+class PriorityOrdersAdapter:
+    kinds = "sssi"
+
+    @staticmethod
+    def boundary_hash(record):
+        return zlib.crc32(record[0].encode("utf-8"))
+
+    @staticmethod
+    def records(orders):
+        current = orders.head
+        while current:
+            yield current.order_id, current.customer_name, current.service_type, current.priority
+            current = current.next
+
+    @staticmethod
+    def options(orders):
+        return {"class": type(orders).__name__}
+
+    @staticmethod
+    def restore(records, options):
+        orders = getattr(priority_orders, options["class"])()
+        for record in records:
+            orders.add_order(*record)
+        return orders
+
+
+class OrderListAdapter:
+    kinds = "sss"
+
+    @staticmethod
+    def boundary_hash(record):
+        return zlib.crc32(record[0].encode("utf-8"))
+
+    @staticmethod
+    def records(orders):
+        current = orders.head
+        while current:
+            yield current.order_id, current.customer_name, current.service_type
+            current = current.next
+
+    @staticmethod
+    def options(orders):
+        return {"class": type(orders).__name__}
+
+    @staticmethod
+    def restore(records, options):
+        orders = getattr(order_list, options["class"])()
+        orders.load_orders(records)
+        return orders
+
+
+class OrderDequeAdapter:
+    # Orders in the usual {"order_id", "customer", "service"} string shape are stored as
+    # typed columns; anything else is kept whole as JSON in the last column
+    kinds = "ssss"
+    fields = ("order_id", "customer", "service")
+
+    @staticmethod
+    def boundary_hash(record):
+        return zlib.crc32((record[0] or record[3]).encode("utf-8"))
+
+    @staticmethod
+    def records(deque):
+        for order in deque.display_orders():
+            try:
+                order_id, customer, service = order["order_id"], order["customer"], order["service"]
+            except (KeyError, TypeError):
+                yield "", "", "", json.dumps(order)
+                continue
+            if len(order) == 3 and type(order_id) is str and type(customer) is str and type(service) is str:
+                yield order_id, customer, service, ""
+            else:
+                yield "", "", "", json.dumps(order)
+
+    @staticmethod
+    def options(deque):
+        return {"class": type(deque).__name__, "max_size": deque.max_size, "overflow": deque.overflow}
+
+    @staticmethod
+    def restore(records, options):
+        deque = getattr(order_deque, options["class"])(options["max_size"], overflow=options["overflow"])
+        orders = ({"order_id": order_id, "customer": customer, "service": service} if not other else json.loads(other)
+                  for order_id, customer, service, other in records)
+        # Straight into the in-memory deque; only orders beyond max_size go through the overflow policy
+        deque.orders.extend(itertools.islice(orders, deque.max_size))
+        for order in orders:
+            deque.add_order_rear(order)
+        return deque
+
+
+def adapter_for(structure):
+    # Checked in order, so subclasses are matched by their base's adapter
+    for structure_class, adapter in (
+        (task_tree.TaskBinaryTree, TaskTreeAdapter),
+        (priority_orders.SinglyLinkedList, PriorityOrdersAdapter),
+        (order_list.SinglyLinkedList, OrderListAdapter),
+        (order_deque.OrderDeque, OrderDequeAdapter),
+    ):
+        if isinstance(structure, structure_class):
+            return adapter
+    raise TypeError(f"Don't know how to snapshot {type(structure).__name__}")
+
+
+ADAPTERS = {adapter.__name__: adapter for adapter in (TaskTreeAdapter, PriorityOrdersAdapter, OrderListAdapter, OrderDequeAdapter)}
+
+
+@contextlib.contextmanager
+def paused_gc():
+    """
+    Pauses the cyclic garbage collector. Checkpoints and restores allocate millions of
+    short tuples next to millions of live records, which the collector would otherwise
+    rescan over and over.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+class SnapshotStore:
+    """
+    Directory of snapshots shared by the task trees, both order lists and OrderDeque.
+    Each named snapshot is a JSON manifest plus content-addressed chunk files whose
+    boundaries depend on the records rather than their positions, so an incremental
+    checkpoint only writes the chunks around what changed.
+    """
+
+    def __init__(self, directory, chunk_size=CHUNK_SIZE):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+    def _manifest_path(self, name):
+        return os.path.join(self.directory, f"{name}.manifest.json")
+
+    def checkpoint(self, name, structure):
+        """
+        Saves structure under name, reusing chunk files that haven't changed.
+        :return: Dict with records, chunks_total, chunks_written and bytes_written.
+        """
+        adapter = adapter_for(structure)
+        chunk_names = []
+        written = bytes_written = count = 0
+        batch = []
+
+        def flush():
+            nonlocal written, bytes_written
+            data = encode_chunk(adapter.kinds, batch)
+            # A cryptographic digest, since an existing file with the same name is reused unread
+            chunk_name = f"{name}-{hashlib.blake2b(data, digest_size=20).hexdigest()}.chunk"
+            path = os.path.join(self.directory, chunk_name)
+            if not os.path.exists(path):
+                with open(path + ".tmp", "wb") as file:
+                    file.write(data)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(path + ".tmp", path)
+                written += 1
+                bytes_written += len(data)
+            chunk_names.append(chunk_name)
+            batch.clear()
+
+        with paused_gc():
+            # Content-defined boundaries, within bounds so chunks stay neither tiny nor huge
+            min_records = max(1, self.chunk_size // 4)
+            max_records = self.chunk_size * 4
+            boundary_hash = adapter.boundary_hash
+            previous_hash = 0
+            for record in adapter.records(structure):
+                batch.append(record)
+                count += 1
+                # Records too early in the chunk to end it (or to precede one that can) aren't hashed
+                if len(batch) < min_records - 1:
+                    continue
+                # Mixing in the previous record's hash keeps boundaries spread out even when
+                # records repeat, while an edit still only moves the boundaries right next to it
+                record_hash = boundary_hash(record)
+                if len(batch) >= min_records and (len(batch) >= max_records or (record_hash ^ (previous_hash >> 1)) % self.chunk_size == 0):
+                    flush()
+                previous_hash = record_hash
+            if batch or not chunk_names:
+                flush()
+
+        previous_chunks = []
+        if self.exists(name):
+            with open(self._manifest_path(name), encoding="utf-8") as file:
+                previous_chunks = json.load(file)["chunks"]
+
+        manifest = {"adapter": adapter.__name__, "options": adapter.options(structure), "records": count, "chunks": chunk_names}
+        manifest_path = self._manifest_path(name)
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        # Chunks only the previous checkpoint used are no longer referenced
+        live = set(chunk_names)
+        for chunk_name in previous_chunks:
+            if chunk_name not in live:
+                os.remove(os.path.join(self.directory, chunk_name))
+        return {"records": count, "chunks_total": len(chunk_names), "chunks_written": written, "bytes_written": bytes_written}
+
+    def restore(self, name):
+        """
+        Rebuilds the structure saved under name.
+        """
+        with open(self._manifest_path(name), encoding="utf-8") as file:
+            manifest = json.load(file)
+        adapter = ADAPTERS[manifest["adapter"]]
+        with paused_gc():
+            # Records are streamed chunk by chunk instead of being gathered into one list first
+            paths = [os.path.join(self.directory, chunk_name) for chunk_name in manifest["chunks"]]
+            records = itertools.chain.from_iterable(zip(*decode_columns(path)) for path in paths)
+            return adapter.restore(records, manifest["options"])
+
+    def exists(self, name):
+        return os.path.exists(self._manifest_path(name))
@@ -0,0 +1,322 @@
+import csv
+import heapq
+import json
+import os
+import sys
+import time
+
+# Binary Tree Implementation
+class TaskNode:
+    __slots__ = ("task", "priority", "left", "right", "height")
+
+    def __init__(self, task):
+        self.task = task
+        self.priority = task['priority']  # Cached so tree walks don't go through the dict
+        self.left = None
+        self.right = None
+        self.height = 1  # Only maintained by BalancedTaskBinaryTree
+
+# Compact node: task fields live in slots instead of a separate dict
+class CompactTaskNode:
+    __slots__ = ("task_type", "priority", "customer", "left", "right", "height")
+
+    def __init__(self, task):
+        self.task_type = sys.intern(task['type'])
+        self.priority = task['priority']
+        self.customer = sys.intern(task['customer'])
+        self.left = None
+        self.right = None
+        self.height = 1
+
+    @property
+    def task(self):
+        """
+        Task-dict view of the node, built on demand.
+        """
+        return {"type": self.task_type, "priority": self.priority, "customer": self.customer}
+
+class TaskBinaryTree:
+    node_class = TaskNode
+
+    def __init__(self):
+        self.root = None
+        # Secondary hash indexes: customer/type -> list of nodes in insertion order
+        self.customer_index = {}
+        self.type_index = {}
+
+    def add_task(self, task):
+        new_node = self._new_node(task)
+        if not self.root:
+            self.root = new_node
+        else:
+            self._insert(self.root, new_node)
+
+    def _new_node(self, task):
+        node = self.node_class(task)
+        self._index_node(node, task)
+        return node
+
+    def _index_node(self, node, task):
+        self.customer_index.setdefault(task['customer'], []).append(node)
+        self.type_index.setdefault(task['type'], []).append(node)
+
+    def _insert(self, current, new_node):
+        """
+        Walks down from current and attaches new_node as a leaf.
+        Equal priorities go right, so tasks with the same priority keep insertion order.
+        """
+        priority = new_node.priority
+        while True:
+            if priority < current.priority:
+                if current.left is None:
+                    current.left = new_node
+                    return
+                current = current.left
+            else:
+                if current.right is None:
+                    current.right = new_node
+                    return
+                current = current.right
+
+    def get_tasks_in_priority_order(self):
+        tasks = []
+        self._in_order_traversal(self.root, tasks)
+        return tasks
+
+    def _in_order_traversal(self, node, tasks):
+        # Explicit stack instead of recursion so deep trees don't hit the recursion limit
+        stack = []
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                tasks.append(node.task)
+                node = node.right
+
+    def iter_tasks(self, start_priority=None):
+        """
+        Lazily yields tasks in priority order without building a list.
+        :param start_priority: Resume from the first task with priority >= this value.
+        """
+        for node in self._iter_nodes(start_priority):
+            yield node.task
+
+    def _iter_nodes(self, start_priority=None):
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                if start_priority is not None and node.priority < start_priority:
+                    # This node and its whole left subtree come before the start point
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                yield node
+                node = node.right
+
+    def __iter__(self):
+        return self.iter_tasks()
+
+    def tasks_in_range(self, low, high):
+        """
+        Yields tasks with low <= priority <= high, skipping subtrees outside the range.
+        """
+        for node in self._iter_nodes(start_priority=low):
+            if node.priority > high:
+                return
+            yield node.task
+
+    def find_task(self, priority):
+        return self._search(self.root, priority)
+
+    def find_tasks(self, priority):
+        """
+        Returns every task with the given priority, in insertion order.
+        """
+        return list(self.tasks_in_range(priority, priority))
+
+    def find_tasks_by_customer(self, customer):
+        return [node.task for node in self.customer_index.get(customer, [])]
+
+    def find_tasks_by_type(self, task_type):
+        return [node.task for node in self.type_index.get(task_type, [])]
+
+    def _search(self, node, priority):
+        while node is not None:
+            if node.priority == priority:
+                return node.task
+            elif priority < node.priority:
+                node = node.left
+            else:
+                node = node.right
+        return None
+
+    def bulk_load(self, path):
+        """
+        Loads tasks from a CSV (type,priority,customer header) or JSONL file and
+        rebuilds the tree as a perfectly balanced tree in O(n).
+        The rows are sorted only if the file isn't already in priority order.
+        Existing tasks are kept and merged with the loaded ones.
+        The whole file is parsed before anything changes, so a bad row leaves the tree as it was.
+        :return: Dict with the number of rows loaded, elapsed seconds and rows/sec.
+        """
+        start = time.perf_counter()
+        tasks = list(read_task_file(path))
+        created = [self.node_class(task) for task in tasks]
+        loaded = created
+        if any(tasks[i]['priority'] < tasks[i - 1]['priority'] for i in range(1, len(tasks))):
+            loaded = sorted(created, key=lambda node: node.priority)  # Stable, keeps file order for ties
+
+        if self.root is None:
+            nodes = loaded
+        else:
+            nodes = list(heapq.merge(self._iter_nodes(), loaded, key=lambda node: node.priority))
+        self.root = self._build_balanced(nodes)
+        # Indexed only now, in file order, so a failed load can't leave entries for nodes not in the tree
+        for node, task in zip(created, tasks):
+            self._index_node(node, task)
+
+        elapsed = time.perf_counter() - start
+        return {"rows": len(loaded), "seconds": elapsed, "rows_per_sec": len(loaded) / elapsed if elapsed else 0.0}
+
+    @staticmethod
+    def _build_balanced(nodes):
+        """
+        Links nodes already sorted by priority into a balanced tree.
+        Every node gets its AVL height, so the result is valid for BalancedTaskBinaryTree too.
+        """
+        if not nodes:
+            return None
+        root = None
+        # Each entry: (low, high, parent, attach_left)
+        stack = [(0, len(nodes), None, False)]
+        while stack:
+            low, high, parent, attach_left = stack.pop()
+            mid = (low + high) // 2
+            node = nodes[mid]
+            node.left = node.right = None
+            node.height = (high - low).bit_length()
+            if parent is None:
+                root = node
+            elif attach_left:
+                parent.left = node
+            else:
+                parent.right = node
+            if low < mid:
+                stack.append((low, mid, node, True))
+            if mid + 1 < high:
+                stack.append((mid + 1, high, node, False))
+        return root
+
+def read_task_file(path):
+    """
+    Streams task dicts from a CSV or JSONL file, in the same shape CarMaintenanceApp.add_task builds.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as file:
+        if extension in (".jsonl", ".json"):
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            yield {"type": row['type'], "priority": int(row['priority']), "customer": row['customer']}
+
+# Self-balancing (AVL) variant of the task tree
+class BalancedTaskBinaryTree(TaskBinaryTree):
+    """
+    Same API as TaskBinaryTree, but rebalances after every insert so the
+    height stays O(log n) even when tasks arrive in sorted priority order.
+    """
+
+    def add_task(self, task):
+        new_node = self._new_node(task)
+        if not self.root:
+            self.root = new_node
+            return
+        # Remember the path from the root so we can rebalance bottom-up without recursion
+        path = []
+        current = self.root
+        priority = new_node.priority
+        while current:
+            path.append(current)
+            if priority < current.priority:
+                current = current.left
+            else:
+                current = current.right
+        parent = path[-1]
+        if priority < parent.priority:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+
+    def _rebalance_path(self, path):
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
+            elif node.height == old_height:
+                # Nothing above this point can have changed height
+                break
+
+    @staticmethod
+    def _height(node):
+        return node.height if node else 0
+
+    def _update_height(self, node):
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _balance_factor(self, node):
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        """
+        Restores the AVL invariant at node and returns the new subtree root.
+        """
+        self._update_height(node)
+        balance = self._balance_factor(node)
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+# Balanced tree with compact nodes for very large task sets
+class CompactTaskBinaryTree(BalancedTaskBinaryTree):
+    """
+    Stores each task's fields directly in a slotted node, with interned type and
+    customer strings. Tasks are returned as freshly built dicts.
+    """
+    node_class = CompactTaskNode
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import types
+
+from core.background import BackgroundJob, TextStream
+
+
+class FakeRoot:
+    """Stands in for Tk: after() callbacks are run by run_until()."""
+
+    def __init__(self):
+        self.pending = []
+        self.bindings = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def bind(self, sequence, callback, add=None):
+        self.bindings.append((sequence, callback))
+
+    def destroy(self):
+        for sequence, callback in self.bindings:
+            if sequence == "<Destroy>":
+                callback(types.SimpleNamespace(widget=self))
+
+    def run_until(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            if self.pending:
+                self.pending.pop(0)()
+            time.sleep(0.001)
+
+
+class FakeWidget:
+    """Records config() options and, for a Text widget, the inserted text."""
+
+    def __init__(self):
+        self.options = {}
+        self.content = ""
+
+    def config(self, **options):
+        self.options.update(options)
+
+    def insert(self, index, text):
+        self.content += text
+
+    def delete(self, first, last=None):
+        self.content = ""
+
+
+def test_streams_every_item_in_order():
+    root = FakeRoot()
+    received, done = [], []
+    job = BackgroundJob(lambda job: range(10000), received.extend, on_done=done.append, batch_size=100).start(root)
+    root.run_until(lambda: done)
+    assert received == list(range(10000))
+    assert job.finished and job.error is None and not job.cancelled
+
+
+def test_destroying_the_root_cancels_running_jobs():
+    root = FakeRoot()
+    done = []
+    job = BackgroundJob(lambda job: iter(range(10 ** 9)), lambda batch: None, on_done=done.append).start(root)
+    root.destroy()
+    assert job.cancelled
+    root.run_until(lambda: done)
+    assert done == [job]
+
+
+def test_unpolled_job_does_not_block_interpreter_exit():
+    # The window is gone, so nothing polls or cancels the job; the worker is stuck on a full queue
+    script = textwrap.dedent("""
+        from core.background import BackgroundJob, TextStream
+
+        class Root:
+            def after(self, ms, callback):
+                pass
+
+        BackgroundJob(lambda job: iter(range(10 ** 9)), lambda batch: None, batch_size=10).start(Root())
+    """)
+    result = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=30)
+    assert result.returncode == 0
+
+
+def test_text_stream_shows_lines_and_restores_widgets():
+    root = FakeRoot()
+    text, status, cancel, button = FakeWidget(), FakeWidget(), FakeWidget(), FakeWidget()
+    listing = TextStream(root, text, status, cancel, busy_widgets=(button,), noun="orders")
+    done = []
+    listing.start(lambda job: (f"Order {i}" for i in range(3)), "Loading orders...", done.append)
+    assert button.options["state"] == "disabled" and cancel.options["state"] == "normal"
+    root.run_until(lambda: done)
+    assert text.content == "Order 0\nOrder 1\nOrder 2\n"
+    assert status.options["text"] == "3 orders."
+    assert button.options["state"] == "normal" and cancel.options["state"] == "disabled"
+
+
+def test_text_stream_superseded_listing_leaves_the_widgets_to_the_new_one():
+    root = FakeRoot()
+    text, status, cancel = FakeWidget(), FakeWidget(), FakeWidget()
+    errors, done = [], []
+    listing = TextStream(root, text, status, cancel, noun="tasks", on_error=errors.append)
+    first = listing.start(lambda job: iter(range(10 ** 9)), "Loading tasks...")
+    listing.start(lambda job: (), "Loading tasks...", done.append)
+    assert first.cancelled
+    root.run_until(lambda: done and first.finished)
+    assert text.content == "No tasks available."
+    assert status.options["text"] == "0 tasks."
+    assert listing.job is None and not errors
@@ -0,0 +1,99 @@
+import random
+
+from core.dispatch_queue import DispatchQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def assert_heap_valid(queue):
+    for index, entry in enumerate(queue.heap):
+        assert queue.position[entry[1]] == index
+        if index:
+            assert queue.heap[(index - 1) // 2][0] <= entry[0]
+    assert len(queue.position) == len(queue.heap)
+
+
+def run_against_reference(queue, clock, aging_seconds, seed, steps=5000):
+    rng = random.Random(seed)
+    # task_id -> [priority, enqueued_at, arrival], where arrival breaks ties first come, first served
+    reference = {}
+    arrivals = 0
+
+    def expected_order():
+        def key(task_id):
+            priority, enqueued_at, arrival = reference[task_id]
+            aged = priority if aging_seconds is None else priority + enqueued_at / aging_seconds
+            return aged, arrival
+        return sorted(reference, key=key)
+
+    for step in range(steps):
+        clock.now += rng.choice((0, 0, 1, 2))
+        choice = rng.random()
+        if choice < 0.4 or not reference:
+            # Few distinct priorities, so plenty of ties
+            task = {"type": "Oil change", "priority": rng.randint(1, 4), "customer": f"C{step}"}
+            task_id = queue.push(task)
+            reference[task_id] = [task["priority"], clock.now, arrivals]
+            arrivals += 1
+        elif choice < 0.6:
+            assert queue.peek()[0] == expected_order()[0]
+            task_id, task = queue.pop()
+            assert task_id == expected_order()[0]
+            del reference[task_id]
+        elif choice < 0.8:
+            # Up or down, and sometimes to the same priority
+            task_id = rng.choice(list(reference))
+            priority = max(0, reference[task_id][0] + rng.choice((-2, -1, 0, 1, 2)))
+            assert queue.update_priority(task_id, priority)
+            reference[task_id][0] = priority
+        else:
+            # Usually from the middle of the heap rather than the root or the last slot
+            task_id = queue.heap[rng.randrange(len(queue.heap))][1]
+            assert queue.remove(task_id)["customer"]
+            del reference[task_id]
+        assert len(queue) == len(reference)
+        if step % 50 == 0:
+            assert_heap_valid(queue)
+    drained = []
+    while queue:
+        drained.append(queue.pop()[0])
+    assert drained == expected_order()
+    assert queue.pop() is None and queue.peek() is None
+
+
+def test_heap_matches_a_sorted_reference():
+    clock = FakeClock()
+    run_against_reference(DispatchQueue(clock=clock), clock, None, seed=1)
+
+
+def test_aged_heap_matches_a_sorted_reference():
+    clock = FakeClock()
+    # Power-of-two aging keeps the reference's float keys exact
+    run_against_reference(DispatchQueue(aging_seconds=4, clock=clock), clock, 4, seed=2)
+
+
+def test_equal_priorities_are_served_in_arrival_order():
+    queue = DispatchQueue()
+    ids = [queue.push({"type": "Inspection", "priority": 2, "customer": name}) for name in "abcdef"]
+    queue.update_priority(ids[1], 2)
+    queue.remove(ids[3])
+    assert [queue.pop()[1]["customer"] for _ in range(5)] == list("abcef")
+
+
+def test_waiting_tasks_age_past_newer_urgent_ones():
+    clock = FakeClock()
+    queue = DispatchQueue(aging_seconds=10, clock=clock)
+    old = queue.push({"type": "Tyre rotation", "priority": 3, "customer": "Early"})
+    clock.now = 25
+    new = queue.push({"type": "Brake check", "priority": 1, "customer": "Late"})
+    assert queue.effective_priority(old) == 0.5
+    assert queue.effective_priority(new) == 1
+    assert queue.pop()[0] == old
+    assert queue.push({"type": "x", "priority": 1, "customer": "y"}, task_id=new) is None
+    assert queue.remove(old) is None and not queue.update_priority(old, 1)
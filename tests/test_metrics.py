@@ -0,0 +1,139 @@
+import asyncio
+import json
+import urllib.request
+
+import pytest
+
+from core import metrics
+from core.order_deque import ConcurrentOrderDeque, OrderDeque
+from core.order_list import SinglyLinkedList
+from core.task_tree import TaskBinaryTree
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    # enable() swaps the module-level registry, so put the original back afterwards
+    monkeypatch.setattr(metrics, "registry", metrics.registry)
+    registry = metrics.MetricsRegistry()
+    metrics.enable(registry)
+    yield registry
+    metrics.disable()
+
+
+def instrumented_functions():
+    return {(cls, name): cls.__dict__[name]
+            for base, methods in metrics._targets()
+            for cls in metrics._subclasses(base)
+            for name in methods if name in cls.__dict__}
+
+
+def test_disable_restores_the_original_functions():
+    originals = instrumented_functions()
+    metrics.enable(metrics.MetricsRegistry())
+    try:
+        assert metrics.is_enabled()
+        wrapped = instrumented_functions()
+        assert all(wrapped[key] is not original and wrapped[key].__wrapped__ is original
+                   for key, original in originals.items())
+        metrics.enable()  # A second enable must not wrap the wrappers
+        assert instrumented_functions() == wrapped
+    finally:
+        metrics.disable()
+    assert not metrics.is_enabled()
+    assert instrumented_functions() == originals
+    assert all(current is originals[key] for key, current in instrumented_functions().items())
+
+
+def test_an_override_calling_super_is_counted_once(recorded):
+    deque = ConcurrentOrderDeque(5)
+    assert deque.add_order_rear({"order_id": 1})
+    OrderDeque(5).add_order_rear({"order_id": 2})
+    assert recorded.calls[("order_deque.ConcurrentOrderDeque", "add_order_rear")] == 1
+    assert recorded.calls[("order_deque.OrderDeque", "add_order_rear")] == 1
+    assert recorded.signals[("order_deque.ConcurrentOrderDeque", "add_order_rear", "deque_length")].sum == 1
+
+
+def test_generators_are_counted_once_with_the_items_yielded(recorded):
+    orders = SinglyLinkedList()
+    for order_id in range(10):
+        orders.add_order(order_id, "Customer", "Oil change")
+    iterator = orders.iter_orders()
+    assert [next(iterator) for _ in range(4)]
+    assert ("order_list.SinglyLinkedList", "iter_orders") not in recorded.calls  # Still running
+    iterator.close()
+    assert recorded.calls[("order_list.SinglyLinkedList", "iter_orders")] == 1
+    yielded = recorded.signals[("order_list.SinglyLinkedList", "iter_orders", "items_yielded")]
+    assert yielded.count == 1 and yielded.sum == 4
+    assert recorded.latency[("order_list.SinglyLinkedList", "iter_orders")].count == 1
+
+
+def test_load_orders_and_async_pops_are_instrumented(recorded):
+    orders = SinglyLinkedList()
+    orders.add_order(0, "Customer", "Oil change")
+    orders.load_orders((order_id, "Customer", "Brakes") for order_id in range(1, 6))
+    assert recorded.calls[("order_list.SinglyLinkedList", "load_orders")] == 1
+    assert recorded.signals[("order_list.SinglyLinkedList", "load_orders", "orders_loaded")].sum == 5
+
+    deque = ConcurrentOrderDeque(5)
+    deque.push_many([{"order_id": 1}, {"order_id": 2}])
+
+    async def pop_both():
+        return await deque.pop_front_async(timeout=1), await deque.pop_rear_async(timeout=1)
+
+    assert asyncio.run(pop_both()) == ({"order_id": 1}, {"order_id": 2})
+    for name in ("pop_front_async", "pop_rear_async"):
+        assert recorded.calls[("order_deque.ConcurrentOrderDeque", name)] == 1
+
+
+def test_errors_are_counted_and_reraised(recorded):
+    tree = TaskBinaryTree()
+    with pytest.raises(KeyError):
+        tree.add_task({"type": "Oil change", "customer": "No priority"})
+    key = ("task_tree.TaskBinaryTree", "add_task")
+    assert recorded.calls[key] == 1 and recorded.errors[key] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram((1, 2, 4))
+    for value in (0, 1, 2, 3, 9, 9):
+        histogram.observe(value)
+    assert histogram.to_dict() == {"count": 6, "sum": 24, "buckets": {"1": 2, "2": 3, "4": 4, "+Inf": 6}}
+
+
+def test_prometheus_and_json_output(recorded):
+    tree = TaskBinaryTree()
+    for priority in (3, 1, 2):
+        tree.add_task({"type": "Inspection", "priority": priority, "customer": "C"})
+    tree.find_task(2)
+
+    text = recorded.to_prometheus()
+    labels = 'structure="task_tree.TaskBinaryTree",method="add_task"'
+    assert "# TYPE cms_calls_total counter" in text
+    assert f"cms_calls_total{{{labels}}} 3" in text.splitlines()
+    assert f"cms_errors_total{{{labels}}} 0" in text.splitlines()
+    assert f'cms_call_seconds_bucket{{{labels},le="+Inf"}} 3' in text.splitlines()
+    assert f"cms_call_seconds_count{{{labels}}} 3" in text.splitlines()
+    # Insert depths 1, 2 and 3
+    assert f"cms_insert_depth_sum{{{labels}}} 6" in text.splitlines()
+    assert text.endswith("\n")
+
+    document = json.loads(recorded.to_json())
+    assert document == json.loads(json.dumps(recorded.to_dict()))
+    add_task = document["task_tree.TaskBinaryTree"]["add_task"]
+    assert add_task["calls"] == 3 and add_task["errors"] == 0
+    assert add_task["signals"]["insert_depth"]["sum"] == 6
+    assert document["task_tree.TaskBinaryTree"]["find_task"]["signals"]["search_depth"]["count"] == 1
+
+
+def test_serve_exposes_both_formats(recorded):
+    SinglyLinkedList().add_order(1, "Customer", "Oil change")
+    server = metrics.serve(port=0)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(base + "/metrics", timeout=5) as response:
+            assert 'method="add_order"' in response.read().decode("utf-8")
+        with urllib.request.urlopen(base + "/metrics.json", timeout=5) as response:
+            assert json.load(response)["order_list.SinglyLinkedList"]["add_order"]["calls"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,133 @@
+import collections
+import random
+import threading
+
+import pytest
+
+from core.order_deque import (ConcurrentOrderDeque, OrderDeque, OrderSpillFile, OVERFLOW_BLOCK, OVERFLOW_SPILL,
+                              SPILL_COMPACT_BYTES, WorkStealingDispatcher)
+
+
+def test_push_many_larger_than_free_space_does_not_deadlock_with_block_policy():
+    deque = ConcurrentOrderDeque(2, overflow=OVERFLOW_BLOCK)
+    popped = []
+    consumer = threading.Thread(target=lambda: popped.append(deque.pop_front(timeout=5)), daemon=True)
+    consumer.start()
+    added = []
+    producer = threading.Thread(target=lambda: added.append(deque.push_many([1, 2, 3], timeout=5)), daemon=True)
+    producer.start()
+    producer.join(5)
+    consumer.join(5)
+    assert not producer.is_alive() and not consumer.is_alive()
+    assert added == [3]
+    assert popped == [1]
+    assert deque.display_orders() == [2, 3]
+
+
+def test_spill_file_matches_a_reference_deque_and_stays_bounded(tmp_path):
+    rng = random.Random(7)
+    spill = OrderSpillFile(str(tmp_path / "spill.seg"))
+    reference = collections.deque()
+    largest = 0
+    for step in range(60000):
+        # Keep a steady state of a few hundred orders so the segment has to be reclaimed
+        if len(reference) < 300 or rng.random() < 0.5:
+            order = {"order_id": step, "customer_name": f"Customer {step}", "service_type": "Oil Change"}
+            if rng.random() < 0.5:
+                spill.push_front(order)
+                reference.appendleft(order)
+            else:
+                spill.push_rear(order)
+                reference.append(order)
+        elif rng.random() < 0.5:
+            assert spill.pop_front() == reference.popleft()
+        else:
+            assert spill.pop_rear() == reference.pop()
+        largest = max(largest, spill.size)
+    assert len(spill) == len(reference)
+    assert list(spill) == list(reference)
+    assert largest < 4 * SPILL_COMPACT_BYTES
+    assert len(spill.front_offsets) + len(spill.rear_offsets) < 4 * len(reference) + 4096
+    spill.close()
+
+
+def test_spill_deque_matches_a_reference_deque(tmp_path):
+    rng = random.Random(11)
+    orders = OrderDeque(20, overflow=OVERFLOW_SPILL, spill_path=str(tmp_path / "orders.spill"))
+    reference = collections.deque()
+    for step in range(20000):
+        choice = rng.random()
+        # Grows past max_size and shrinks back, so orders keep moving between memory and disk
+        grow = 0.55 if (step // 2000) % 2 == 0 else 0.4
+        if choice < grow / 2:
+            assert orders.add_order_front({"order_id": step})
+            reference.appendleft({"order_id": step})
+        elif choice < grow:
+            assert orders.add_order_rear({"order_id": step})
+            reference.append({"order_id": step})
+        elif choice < (1 + grow) / 2:
+            assert orders.remove_order_front() == (reference.popleft() if reference else None)
+        else:
+            assert orders.remove_order_rear() == (reference.pop() if reference else None)
+        assert len(orders) == len(reference)
+        if step % 997 == 0:
+            assert orders.display_orders() == list(reference)
+    assert orders.display_orders() == list(reference)
+    orders.close()
+
+
+def test_orders_window_matches_a_slice_of_every_order(tmp_path):
+    orders = OrderDeque(300, overflow=OVERFLOW_SPILL, spill_path=str(tmp_path / "orders.spill"))
+    for order_id in range(500):
+        assert orders.add_order_rear({"order_id": order_id})
+    everything = orders.display_orders()
+    # Short and long windows at both ends, in the middle and across the memory/disk boundary
+    for start in (0, 1, 120, 150, 280, 299, 300, 450, 499, 500):
+        for count in (1, 25, 63, 64, 200):
+            assert orders.orders_window(start, count) == everything[start:start + count]
+    orders.close()
+
+
+@pytest.mark.parametrize("steal", [True, False])
+def test_dispatcher_services_every_order_exactly_once(steal):
+    handled = []
+
+    def handle_order(order):
+        handled.append(order["order_id"])
+        # Some orders lead to a follow-up, submitted while the run is active
+        if order["order_id"] % 7 == 0 and order["order_id"] < 100000:
+            assert dispatcher.submit({"order_id": order["order_id"] + 100000})
+
+    dispatcher = WorkStealingDispatcher(4, handle_order, steal=steal)
+    rng = random.Random(3)
+    for order_id in range(3000):
+        # Mostly one technician, so the others have to steal
+        assert dispatcher.submit({"order_id": order_id}, 0 if rng.random() < 0.8 else None)
+    # Orders from outside land in this run or, if it has already finished, the next one
+    outside = threading.Thread(target=lambda: [dispatcher.submit({"order_id": 200000 + i}) for i in range(500)])
+    outside.start()
+    reports = [dispatcher.run()]
+    outside.join()
+    reports.append(dispatcher.run())
+
+    expected = list(range(3000)) + [i + 100000 for i in range(0, 3000, 7)] + [200000 + i for i in range(500)]
+    assert sorted(handled) == sorted(expected)
+    assert sum(stats["processed"] for report in reports for stats in report["technicians"]) == len(expected)
+    assert all(len(queue) == 0 for queue in dispatcher.queues)
+    if not steal:
+        assert all(stats["steals"] == 0 for report in reports for stats in report["technicians"])
+
+
+def test_dispatcher_run_raises_instead_of_hanging_when_an_order_fails():
+    def handle_order(order):
+        if order == 5:
+            raise ValueError(order)
+
+    dispatcher = WorkStealingDispatcher(3, handle_order)
+    for order in range(50):
+        dispatcher.submit(order)
+    errors = []
+    runner = threading.Thread(target=lambda: errors.append(pytest.raises(ValueError, dispatcher.run)))
+    runner.start()
+    runner.join(10)
+    assert not runner.is_alive() and errors
@@ -0,0 +1,70 @@
+import random
+
+from core.order_list import SinglyLinkedList
+
+
+def page_through(orders, page_size):
+    pages = []
+    cursor = None
+    while len(pages) <= len(orders.display_orders()):
+        page = list(orders.iter_order_nodes(start_after_node=cursor, limit=page_size))
+        if not page:
+            break
+        pages.append([node.customer_name for node in page])
+        cursor = page[-1]
+    return pages
+
+
+def test_paging_with_duplicate_ids_reaches_the_end():
+    orders = SinglyLinkedList()
+    for i in range(7):
+        orders.add_order("same", f"Customer {i}", "Oil Change")
+    assert page_through(orders, 3) == [["Customer 0", "Customer 1", "Customer 2"],
+                                       ["Customer 3", "Customer 4", "Customer 5"],
+                                       ["Customer 6"]]
+
+
+def test_paging_resumes_after_a_removed_cursor_node():
+    orders = SinglyLinkedList()
+    for i in range(6):
+        orders.add_order(str(i), f"Customer {i}", "Oil Change")
+    cursor = list(orders.iter_order_nodes(limit=3))[-1]
+    orders.remove_order("2")
+    orders.remove_order("3")
+    assert [node.order_id for node in orders.iter_order_nodes(start_after_node=cursor)] == ["4", "5"]
+
+
+def test_paging_resumes_after_removed_tails_once_orders_are_appended():
+    orders = SinglyLinkedList()
+    for i in range(4):
+        orders.add_order(str(i), f"Customer {i}", "Oil Change")
+    cursors = list(orders.iter_order_nodes())
+    orders.remove_order("3")
+    orders.remove_order("2")
+    assert list(orders.iter_order_nodes(start_after_node=cursors[2])) == []
+    orders.add_order("4", "Customer 4", "Oil Change")
+    orders.load_orders([("5", "Customer 5", "Oil Change")])
+    for cursor in cursors[1:]:
+        assert [node.order_id for node in orders.iter_order_nodes(start_after_node=cursor)] == ["4", "5"]
+
+
+def test_removed_cursors_match_a_reference_list():
+    rng = random.Random(2)
+    orders = SinglyLinkedList()
+    live = []       # Nodes in list order
+    appended = {}   # Every node ever added -> its place in append order
+    for step in range(3000):
+        choice = rng.random()
+        if choice < 0.4 or not live:
+            orders.add_order(str(step % 7), "Customer", "Oil Change")
+            live.append(orders.tail)
+            appended[orders.tail] = step
+        elif choice < 0.7:
+            order_id = rng.choice(live).order_id
+            assert orders.remove_order(order_id)
+            live.remove(next(node for node in live if node.order_id == order_id))
+        else:
+            cursor = rng.choice(list(appended))
+            expected = [node for node in live if appended[node] > appended[cursor]][:5]
+            assert list(orders.iter_order_nodes(start_after_node=cursor, limit=5)) == expected
+    assert list(orders.iter_order_nodes()) == live
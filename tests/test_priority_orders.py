@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from core.priority_orders import BucketedOrderList, SinglyLinkedList
+
+
+def chain(orders):
+    nodes = []
+    node = orders.head
+    while node:
+        nodes.append(node)
+        node = node.next
+    return nodes
+
+
+def filled(cls, rng, size, shape):
+    orders = cls()
+    for i in range(size):
+        if shape == "ascending":
+            priority = i // 3
+        elif shape == "descending":
+            priority = size - i // 2
+        else:
+            priority = rng.randint(1, 5)  # Few distinct values, so plenty of ties
+        orders.add_order(i, f"Customer {rng.randint(0, 3)}", "Oil change", priority)
+    return orders
+
+
+class OnlyLessThan:
+    # Keys that, like those sorted() accepts, only need __lt__
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+
+class Descending(OnlyLessThan):
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+KEYS = [None, lambda node: node.customer_name, lambda node: (node.customer_name, node.priority),
+        lambda node: OnlyLessThan(node.priority)]
+
+
+@pytest.mark.parametrize("shape", ["random", "ascending", "descending"])
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("key", KEYS)
+def test_merge_sort_matches_sorted(shape, reverse, key):
+    rng = random.Random(3)
+    for size in list(range(8)) + [50, 333]:
+        orders = filled(SinglyLinkedList, rng, size, shape)
+        # Compared by identity, so equal keys must keep their order, as sorted() keeps them
+        expected = sorted(chain(orders), key=key or (lambda node: node.priority), reverse=reverse)
+        orders.merge_sort(key=key, reverse=reverse)
+        assert chain(orders) == expected
+        assert orders.tail is (expected[-1] if expected else None)
+        if orders.tail is not None:
+            assert orders.tail.next is None
+
+
+def test_appending_after_a_merge_sort_uses_the_new_tail():
+    orders = filled(SinglyLinkedList, random.Random(5), 100, "random")
+    orders.merge_sort()
+    orders.add_order(100, "Late", "Brakes", 0)
+    assert chain(orders)[-1].order_id == 100 and len(chain(orders)) == 101
+
+
+def test_insertion_sort_matches_sorted():
+    orders = filled(SinglyLinkedList, random.Random(9), 200, "random")
+    expected = sorted(chain(orders), key=lambda node: node.priority)
+    orders.insertion_sort()
+    assert [node.priority for node in chain(orders)] == [node.priority for node in expected]
+    assert orders.tail is chain(orders)[-1]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_bucketed_merge_sort_orders_by_priority_then_key(reverse):
+    orders = filled(BucketedOrderList, random.Random(13), 300, "random")
+    expected = sorted(chain(orders), key=lambda node: node.priority)  # Buckets stay ascending
+    expected = sorted(expected, key=lambda node: (node.priority, node.customer_name) if not reverse
+                      else (node.priority, Descending(node.customer_name)))
+    orders.merge_sort(key=lambda node: node.customer_name, reverse=reverse)
+    assert chain(orders) == expected
+    assert orders.tail is expected[-1] and orders.tail.next is None
+    for priority in orders.priorities:
+        assert orders.bucket_heads[priority].priority == priority
+        assert orders.bucket_tails[priority].next is None or orders.bucket_tails[priority].next.priority > priority
+    # Appends still land at the end of their bucket
+    orders.add_order(300, "Zed", "Brakes", orders.priorities[0])
+    assert orders.bucket_tails[orders.priorities[0]].order_id == 300
+
@@ -0,0 +1,159 @@
+import random
+
+from core.service_tree import IndexedServiceTree, TreeNode, load_service_tree
+
+
+def assert_same_tree(loaded, built):
+    assert loaded.name == built.name
+    assert loaded.subtree_size == built.subtree_size
+    assert loaded.aggregates == built.aggregates
+    loaded_children = sorted(loaded.children, key=lambda node: node.name)
+    built_children = sorted(built.children, key=lambda node: node.name)
+    assert len(loaded_children) == len(built_children)
+    for loaded_child, built_child in zip(loaded_children, built_children):
+        assert_same_tree(loaded_child, built_child)
+
+
+def test_loader_rollups_match_add_child(tmp_path):
+    random.seed(7)
+    rows = [("Root", "", 1)] + [(f"S{i}", "Root" if i == 0 else f"S{random.randrange(i)}", i % 9) for i in range(500)]
+    built = {"Root": TreeNode("Root", {"price": 1.0})}
+    for name, parent, price in rows[1:]:
+        built[name] = TreeNode(name, {"price": float(price)})
+        built[parent].add_child(built[name])
+    path = tmp_path / "catalog.csv"
+    # Children before parents, so the loader has to create placeholders and fill them in
+    path.write_text("parent,name,price\n" + "".join(f"{parent},{name},{price}\n" for name, parent, price in reversed(rows)))
+    assert_same_tree(load_service_tree(str(path)), built["Root"])
+
+
+def test_loading_a_deep_chain_is_linear(tmp_path):
+    depth = 50000
+    path = tmp_path / "chain.csv"
+    path.write_text("parent,name\n,S0\n" + "".join(f"S{i - 1},S{i}\n" for i in range(1, depth)))
+    root = load_service_tree(str(path))
+    assert root.subtree_size == depth
+    leaf = root
+    while leaf.children:
+        leaf = leaf.children[0]
+    assert leaf.name == f"S{depth - 1}" and leaf.subtree_size == 1
+
+
+def ancestors(node, top):
+    chain = [node]
+    while chain[-1] is not top:
+        chain.append(chain[-1].parent)
+    return chain
+
+
+def assert_index_matches_tree(index, nodes):
+    for node in nodes:
+        chain = ancestors(node, index.root)
+        assert index.depth[node] == len(chain) - 1
+        assert index.entry[node] < index.exit[node]
+    for _ in range(2000):
+        first, second = random.choice(nodes), random.choice(nodes)
+        first_chain, second_chain = ancestors(first, index.root), ancestors(second, index.root)
+        assert index.is_ancestor(first, second) == (first in second_chain)
+        expected = next(node for node in first_chain if node in second_chain)
+        assert index.lowest_common_ancestor(first, second) is expected
+
+
+def test_euler_and_lca_invariants_hold_as_subtrees_are_attached():
+    random.seed(3)
+    root = TreeNode("Root")
+    nodes = [root]
+    for i in range(200):
+        node = TreeNode(f"S{i}")
+        random.choice(nodes).add_child(node)
+        nodes.append(node)
+    index = IndexedServiceTree(root)
+    assert_index_matches_tree(index, nodes)
+    for i in range(200, 1200):
+        # Mostly single services, sometimes a small prebuilt subtree
+        node = TreeNode(f"S{i}")
+        if i % 10 == 0:
+            node.add_child(TreeNode(f"S{i}-a"))
+            node.children[0].add_child(TreeNode(f"S{i}-b"))
+        random.choice(nodes).add_child(node)
+        nodes.extend(found for found, depth in node.iter_preorder())
+    assert_index_matches_tree(index, nodes)
+
+
+def test_appending_under_one_category_rarely_renumbers_the_whole_tree(monkeypatch):
+    root = TreeNode("Root")
+    categories = [TreeNode(f"Category {i}") for i in range(3)]
+    for category in categories:
+        root.add_child(category)
+    index = IndexedServiceTree(root)
+    renumbers = []
+    monkeypatch.setattr(index, "_renumber", lambda: renumbers.append(1))
+    for i in range(2000):
+        categories[1].add_child(TreeNode(f"Service {i}"))
+        root.add_child(TreeNode(f"Tail {i}"))
+    assert not renumbers
+    assert_index_matches_tree(index, list(node for node, depth in root.iter_preorder()))
+
+
+def test_indexing_a_subtree_keeps_it_attached_and_the_outer_index_current():
+    root = TreeNode("Root")
+    category = TreeNode("Category")
+    root.add_child(category)
+    outer = IndexedServiceTree(root)
+    inner = IndexedServiceTree(category)
+    assert category.parent is root
+    assert inner.depth[category] == 0 and outer.depth[category] == 1
+    service = TreeNode("Service")
+    category.add_child(service)
+    assert outer.is_under("Service", "Root") and inner.is_under("Service", "Category")
+    assert outer.depth[service] == 2 and inner.depth[service] == 1
+
+
+def edit_distance(a, b):
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        new_row = [i]
+        for j, other in enumerate(b, 1):
+            new_row.append(min(new_row[-1] + 1, row[j] + 1, row[j - 1] + (char != other)))
+        row = new_row
+    return row[-1]
+
+
+def test_search_matches_a_brute_force_scan():
+    random.seed(11)
+    root = TreeNode("Root")
+    names = sorted({"".join(random.choice("abc ") for _ in range(random.randint(1, 7))) for _ in range(300)})
+    for name in names:
+        root.add_child(TreeNode(name))
+    search = IndexedServiceTree(root, searchable=True).search
+    keyed = sorted(names + ["Root"], key=str.lower)
+    for query in ["", "a", "ab", "Abc", "cab", "bca a", "zz", "abcabc"]:
+        assert search.complete(query, 5) == [(name, ["Root", name] if name != "Root" else ["Root"])
+                                              for name in keyed if name.lower().startswith(query.lower())][:5]
+        for max_distance in (0, 1, 2):
+            for limit in (3, 1000):
+                for prefixes in (False, True):
+                    expected = []
+                    for name in keyed:
+                        lowered = name.lower()
+                        if prefixes:
+                            distance = min(edit_distance(lowered[:end], query.lower()) for end in range(len(lowered) + 1))
+                        else:
+                            distance = edit_distance(lowered, query.lower())
+                        if distance <= max_distance:
+                            expected.append((distance, name))
+                    expected.sort(key=lambda match: match[0])  # Stable, so names stay alphabetical
+                    found = search.fuzzy(query, max_distance, limit, prefixes=prefixes)
+                    assert [(name, distance) for name, distance, path in found] == \
+                        [(name, distance) for distance, name in expected[:limit]]
+
+
+def test_search_sees_services_attached_after_indexing():
+    root = TreeNode("Root")
+    category = TreeNode("Brakes")
+    root.add_child(category)
+    search = IndexedServiceTree(root, searchable=True).search
+    assert search.complete("pad") == []
+    category.add_child(TreeNode("Pad replacement"))
+    assert search.complete("pad") == [("Pad replacement", ["Root", "Brakes", "Pad replacement"])]
+    assert search.fuzzy("pda", max_distance=1, prefixes=True) == [("Pad replacement", 1, ["Root", "Brakes", "Pad replacement"])]
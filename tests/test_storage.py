@@ -0,0 +1,158 @@
+import os
+import random
+
+import pytest
+
+from core import order_deque, order_list, priority_orders, task_tree
+from core.storage import SnapshotStore
+
+
+def make_orders(n):
+    orders = order_list.SinglyLinkedList()
+    for i in range(n):
+        orders.add_order(str(i), f"Customer {i % 7}", "Oil Change")
+    return orders
+
+
+def test_chunks_are_named_by_a_cryptographic_digest(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=16)
+    store.checkpoint("orders", make_orders(100))
+    chunk_names = [name for name in os.listdir(tmp_path) if name.endswith(".chunk")]
+    assert chunk_names
+    for chunk_name in chunk_names:
+        digest = chunk_name[len("orders-"):-len(".chunk")]
+        assert len(digest) == 40 and int(digest, 16) >= 0
+
+
+def test_order_list_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=16)
+    orders = make_orders(100)
+    store.checkpoint("orders", orders)
+    restored = store.restore("orders")
+    assert restored.display_orders() == orders.display_orders()
+    assert restored.find_order("42").customer_name == "Customer 0"
+
+
+def test_removing_the_first_order_rewrites_only_one_chunk(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=64)
+    orders = make_orders(5000)
+    first = store.checkpoint("orders", orders)
+    assert first["chunks_total"] > 10
+    orders.remove_order("0")
+    second = store.checkpoint("orders", orders)
+    assert second["chunks_written"] == 1
+    assert store.restore("orders").display_orders() == orders.display_orders()
+
+
+def test_inserting_a_task_mid_tree_rewrites_only_one_chunk(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=64)
+    tree = task_tree.BalancedTaskBinaryTree()
+    for i in range(5000):
+        tree.add_task({"type": "Oil Change", "priority": i % 100, "customer": f"Customer {i}"})
+    store.checkpoint("tasks", tree)
+    tree.add_task({"type": "Brake Check", "priority": 50, "customer": "Late customer"})
+    assert store.checkpoint("tasks", tree)["chunks_written"] == 1
+    assert store.restore("tasks").get_tasks_in_priority_order() == tree.get_tasks_in_priority_order()
+
+
+def test_unreferenced_chunks_are_removed(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=64)
+    orders = make_orders(5000)
+    store.checkpoint("orders", orders)
+    other = make_orders(10)
+    store.checkpoint("other", other)
+    for order_id in range(0, 5000, 7):
+        orders.remove_order(str(order_id))
+    result = store.checkpoint("orders", orders)
+    chunk_files = [name for name in os.listdir(tmp_path) if name.startswith("orders-")]
+    assert len(chunk_files) == result["chunks_total"]
+    assert store.restore("other").display_orders() == other.display_orders()
+
+
+def test_restored_order_list_is_indexed_on_first_lookup(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=64)
+    store.checkpoint("orders", make_orders(1000))
+    restored = store.restore("orders")
+    restored.add_order("extra", "Customer", "Brake Check")
+    assert restored.has_order("extra") and restored.has_order("999")
+    assert restored.remove_order("0") and not restored.has_order("0")
+    assert restored.head.order_id == "1" and restored.head.prev is None
+    assert restored.tail.order_id == "extra"
+
+
+def round_trip(tmp_path, structure, chunk_size=16):
+    store = SnapshotStore(str(tmp_path), chunk_size=chunk_size)
+    store.checkpoint("structure", structure)
+    return store.restore("structure")
+
+
+@pytest.mark.parametrize("tree_class", [task_tree.TaskBinaryTree, task_tree.BalancedTaskBinaryTree,
+                                        task_tree.CompactTaskBinaryTree])
+def test_task_tree_round_trip(tmp_path, tree_class):
+    tree = tree_class()
+    rng = random.Random(5)
+    for i in range(300):
+        # Repeated priorities, negative and large values and non-ASCII names
+        tree.add_task({"type": rng.choice(["Oil Change", "Brake Check", "Ölwechsel"]),
+                       "priority": rng.choice([-3, 0, 1, 1, 2, 2 ** 40]), "customer": f"Customer {i % 11} ✓"})
+    restored = round_trip(tmp_path, tree)
+    assert type(restored) is tree_class
+    assert restored.get_tasks_in_priority_order() == tree.get_tasks_in_priority_order()
+    # The snapshot keeps priority order, not insertion order, so the index is compared regardless of order
+    by_priority = lambda task: (task['priority'], task['type'])
+    assert (sorted(restored.find_tasks_by_customer("Customer 3 ✓"), key=by_priority)
+            == sorted(tree.find_tasks_by_customer("Customer 3 ✓"), key=by_priority))
+
+
+@pytest.mark.parametrize("list_class", [priority_orders.SinglyLinkedList, priority_orders.BucketedOrderList])
+def test_priority_order_list_round_trip(tmp_path, list_class):
+    orders = list_class()
+    for i in range(200):
+        orders.add_order(str(i % 50), f"Customer {i}", "Tire Rotation", i % 3 + 1)
+    restored = round_trip(tmp_path, orders)
+    assert type(restored) is list_class
+    assert restored.display_orders() == orders.display_orders()
+
+
+@pytest.mark.parametrize("overflow", [order_deque.OVERFLOW_EVICT, order_deque.OVERFLOW_SPILL])
+def test_order_deque_round_trip(tmp_path, overflow):
+    orders = order_deque.OrderDeque(50, overflow=overflow)
+    for i in range(120):
+        orders.add_order_rear({"order_id": i, "customer": f"Customer {i}", "notes": None if i % 2 else ["a", 1.5]})
+    restored = round_trip(tmp_path, orders)
+    assert restored.display_orders() == orders.display_orders()
+    assert (restored.max_size, restored.overflow) == (50, overflow)
+    orders.close()
+    restored.close()
+
+
+def test_empty_structures_round_trip(tmp_path):
+    assert round_trip(tmp_path / "tree", task_tree.BalancedTaskBinaryTree()).get_tasks_in_priority_order() == []
+    assert round_trip(tmp_path / "orders", order_list.SinglyLinkedList()).display_orders() == []
+    assert round_trip(tmp_path / "deque", order_deque.OrderDeque(10)).display_orders() == []
+
+
+def test_adding_after_a_restore_indexes_the_order_once(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_size=16)
+    store.checkpoint("orders", make_orders(10))
+    restored = store.restore("orders")
+    restored.add_order("new", "Customer", "Oil Change")
+    assert restored.index["new"] == [restored.tail]
+    assert restored.remove_order("new")
+    assert not restored.remove_order("new")
+    assert restored.display_orders() == make_orders(10).display_orders()
+
+
+def test_order_deque_round_trip_mixes_columnar_and_json_orders(tmp_path):
+    orders = order_deque.OrderDeque(30, overflow=order_deque.OVERFLOW_SPILL)
+    for i in range(80):
+        if i % 5:
+            orders.add_order_rear({"order_id": str(i), "customer": f"Customer {i}", "service": "Oil Change"})
+        else:
+            # Not the usual three string fields, so kept whole as JSON
+            orders.add_order_rear({"order_id": i, "customer": f"Customer {i}", "service": "Oil Change", "vip": True})
+    restored = round_trip(tmp_path, orders)
+    assert restored.display_orders() == orders.display_orders()
+    assert len(restored.orders) == 30 and len(restored.spill) == 50
+    orders.close()
+    restored.close()
@@ -0,0 +1,75 @@
+import math
+import random
+
+import pytest
+
+from core.task_tree import BalancedTaskBinaryTree
+
+
+def test_bulk_load_with_a_bad_row_leaves_the_tree_and_indexes_unchanged(tmp_path):
+    tree = BalancedTaskBinaryTree()
+    tree.add_task({"type": "Oil Change", "priority": 2, "customer": "Alice"})
+    path = tmp_path / "tasks.csv"
+    path.write_text("type,priority,customer\nTire Rotation,1,Alice\nBrake Check,soon,Bob\n")
+    with pytest.raises(ValueError):
+        tree.bulk_load(str(path))
+    assert tree.get_tasks_in_priority_order() == [{"type": "Oil Change", "priority": 2, "customer": "Alice"}]
+    assert tree.find_tasks_by_customer("Alice") == [{"type": "Oil Change", "priority": 2, "customer": "Alice"}]
+    assert tree.find_tasks_by_type("Tire Rotation") == []
+
+
+def test_bulk_load_indexes_loaded_tasks_in_file_order(tmp_path):
+    tree = BalancedTaskBinaryTree()
+    path = tmp_path / "tasks.csv"
+    path.write_text("type,priority,customer\nTire Rotation,3,Alice\nOil Change,1,Alice\n")
+    assert tree.bulk_load(str(path))["rows"] == 2
+    assert [task['priority'] for task in tree.get_tasks_in_priority_order()] == [1, 3]
+    assert [task['type'] for task in tree.find_tasks_by_customer("Alice")] == ["Tire Rotation", "Oil Change"]
+
+
+def check_avl(node, low=None, high=None):
+    """Returns the subtree height, asserting heights, balance and priority order on the way."""
+    if node is None:
+        return 0
+    assert low is None or node.priority >= low
+    assert high is None or node.priority <= high
+    left = check_avl(node.left, low, node.priority)
+    right = check_avl(node.right, node.priority, high)
+    assert abs(left - right) <= 1
+    assert node.height == max(left, right) + 1
+    return node.height
+
+
+@pytest.mark.parametrize("intake", ["sorted", "reversed", "random", "few priorities"])
+def test_avl_invariants_hold_after_every_insert(intake):
+    rng = random.Random(9)
+    priorities = list(range(500))
+    if intake == "reversed":
+        priorities.reverse()
+    elif intake == "random":
+        rng.shuffle(priorities)
+    elif intake == "few priorities":
+        priorities = [rng.randint(1, 3) for _ in range(500)]
+    tree = BalancedTaskBinaryTree()
+    for i, priority in enumerate(priorities):
+        tree.add_task({"type": "Oil Change", "priority": priority, "customer": f"Customer {i}"})
+        if i % 50 == 0:
+            check_avl(tree.root)
+    assert check_avl(tree.root) <= 1.45 * math.log2(len(priorities) + 2)
+    # Equal priorities keep their insertion order
+    tasks = tree.get_tasks_in_priority_order()
+    assert tasks == sorted(tasks, key=lambda task: task['priority'])
+    assert [int(task['customer'].split()[1]) for task in tasks] == sorted(range(500), key=lambda i: (priorities[i], i))
+
+
+def test_avl_invariants_hold_after_bulk_load_and_further_inserts(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("type,priority,customer\n" + "".join(f"Oil Change,{i % 37},Customer {i}\n" for i in range(1000)))
+    tree = BalancedTaskBinaryTree()
+    tree.add_task({"type": "Brake Check", "priority": 5, "customer": "Existing"})
+    tree.bulk_load(str(path))
+    check_avl(tree.root)
+    for i in range(300):
+        tree.add_task({"type": "Tire Rotation", "priority": 40 + i, "customer": "Later"})
+    check_avl(tree.root)
+    assert len(tree.get_tasks_in_priority_order()) == 1301
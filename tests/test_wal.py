@@ -0,0 +1,52 @@
+import time
+
+from core import order_deque
+from core.order_deque import OrderDeque, OrderWriteAheadLog
+
+
+def open_deque(path):
+    return OrderDeque(100, wal=OrderWriteAheadLog(path, fsync_batch=1000, fsync_interval=0.05))
+
+
+def test_replay_after_a_torn_write_keeps_later_records(tmp_path):
+    path = str(tmp_path / "orders.wal")
+    orders = open_deque(path)
+    for i in range(3):
+        orders.add_order_rear({"order_id": i})
+    orders.remove_order_front()
+    orders.close()
+    with open(path, "ab") as file:
+        file.write(b'[5, "add_rear", {"order_')  # The process died part-way through a record
+
+    orders = open_deque(path)
+    assert orders.display_orders() == [{"order_id": 1}, {"order_id": 2}]
+    orders.add_order_rear({"order_id": 3})
+    orders.close()
+
+    orders = open_deque(path)
+    assert orders.display_orders() == [{"order_id": 1}, {"order_id": 2}, {"order_id": 3}]
+    orders.close()
+
+
+def test_records_reach_the_file_without_waiting_for_a_sync(tmp_path):
+    path = str(tmp_path / "orders.wal")
+    orders = open_deque(path)
+    orders.add_order_rear({"order_id": 1})
+    with open(path, encoding="utf-8") as file:
+        assert file.read().count("\n") == 1
+    orders.close()
+
+
+def test_interval_sync_runs_without_further_appends(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = order_deque.os.fsync
+    monkeypatch.setattr(order_deque.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    orders = open_deque(str(tmp_path / "orders.wal"))
+    orders.add_order_rear({"order_id": 1})
+    deadline = time.monotonic() + 2
+    while not synced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert synced
+    with orders.wal.lock:
+        assert orders.wal.pending == 0 and orders.wal.timer is None
+    orders.close()